@@ -0,0 +1,191 @@
+"""Non-interactive bulk import and analytics for the calorie tracker.
+
+Streams exported food-diary CSV files (``user,date,meal,calories``) in
+chunks, skips malformed rows instead of crashing, and computes per-user
+and per-day totals, averages and limit-exceed counts with pandas
+group-bys. One text report per user is written by a thread pool.
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calorie_store import CalorieStore
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+COLUMNS = ["user", "date", "meal", "calories"]
+CHUNK_SIZE = 500_000
+
+
+def _read_chunks(reader, stats):
+    # on_bad_lines="warn" makes pandas report every skipped line as a
+    # ParserWarning; catching them per chunk lets us count them.
+    while True:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", pd.errors.ParserWarning)
+            chunk = next(reader, None)
+        stats["bad_lines"] += sum(str(w.message).count("Skipping line")
+                                  for w in caught if issubclass(w.category, pd.errors.ParserWarning))
+        if chunk is None:
+            return
+        yield chunk
+
+
+def iter_meal_chunks(path, chunk_size=CHUNK_SIZE, stats=None):
+    """Yield cleaned ``user, date, meal, calories`` frames from a diary file.
+
+    Lines with too many fields are skipped by the parser and counted in
+    ``stats["bad_lines"]``; rows with a blank user or meal, an
+    unparseable date, or a calorie value that is not a finite number
+    of at least zero (``inf`` included) are dropped and counted in
+    ``stats["bad_rows"]``.
+    """
+    stats = stats if stats is not None else {}
+    for key in ("rows", "bad_rows", "bad_lines"):
+        stats.setdefault(key, 0)
+
+    reader = pd.read_csv(
+        path, chunksize=chunk_size, dtype=str, on_bad_lines="warn",
+        skipinitialspace=True, names=COLUMNS, header=0, index_col=False,
+    )
+    for chunk in _read_chunks(reader, stats):
+        stats["rows"] += len(chunk)
+        chunk["user"] = chunk["user"].str.strip()
+        chunk["meal"] = chunk["meal"].str.strip().str.upper()
+        chunk["date"] = pd.to_datetime(chunk["date"], errors="coerce", format="mixed").dt.normalize()
+        chunk["calories"] = pd.to_numeric(chunk["calories"], errors="coerce")
+
+        valid = chunk["user"].notna() & (chunk["user"] != "") \
+            & chunk["meal"].notna() & (chunk["meal"] != "") \
+            & chunk["date"].notna() & np.isfinite(chunk["calories"]) & (chunk["calories"] >= 0)
+        stats["bad_rows"] += int((~valid).sum())
+        yield chunk[valid]
+
+
+def daily_totals(paths, chunk_size=CHUNK_SIZE, store=None):
+    """Return per-user, per-day ``calories``/``meals`` totals for many files.
+
+    Each chunk is reduced to partial daily sums before the partials are
+    combined, so memory is bound by the number of user-days, not meals.
+    When ``store`` is given, the meals are also appended to it.
+    """
+    partials = []
+    stats = {}
+    for path in paths:
+        logging.info("Importing %s", path)
+        for chunk in iter_meal_chunks(path, chunk_size, stats):
+            partials.append(
+                chunk.groupby(["user", "date"], sort=False)["calories"].agg(calories="sum", meals="count")
+            )
+            if store is not None:
+                store.add_meals(zip(chunk["user"], chunk["date"].dt.date, chunk["meal"], chunk["calories"]))
+
+    logging.info("Read %d rows, skipped %d malformed lines and %d invalid rows",
+                 stats.get("rows", 0), stats.get("bad_lines", 0), stats.get("bad_rows", 0))
+    if not partials:
+        return pd.DataFrame(columns=["calories", "meals"],
+                            index=pd.MultiIndex.from_tuples([], names=["user", "date"]))
+    return pd.concat(partials).groupby(level=["user", "date"]).sum()
+
+
+def user_summary(daily, limit):
+    """Per-user totals, averages and number of days above ``limit``."""
+    flat = daily.reset_index()
+    flat["over_limit"] = flat["calories"] > limit
+    summary = flat.groupby("user").agg(
+        days=("calories", "size"),
+        total_calories=("calories", "sum"),
+        meals=("meals", "sum"),
+        days_over_limit=("over_limit", "sum"),
+        first_day=("date", "min"),
+        last_day=("date", "max"),
+    )
+    summary["avg_per_day"] = summary["total_calories"] / summary["days"]
+    summary["avg_per_meal"] = summary["total_calories"] / summary["meals"]
+    return summary
+
+
+def _safe_filename(user):
+    # Sanitizing alone maps e.g. "ann b" and "ann_b" to the same name, so
+    # a short hash of the original name keeps every user's file distinct.
+    digest = hashlib.sha1(user.encode("utf-8")).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', user) or 'user'}-{digest}"
+
+
+def write_user_report(user, summary_row, user_daily, limit, out_dir):
+    lines = [
+        "===== CALORIE HISTORY REPORT =====",
+        f"NAME: {user}",
+        f"PERIOD: {summary_row.first_day:%Y-%m-%d} to {summary_row.last_day:%Y-%m-%d}",
+        "",
+        f"{'Date':<12}{'Meals':>6}{'Calories':>12}  Status",
+    ]
+    lines.extend(
+        f"{day:%Y-%m-%d}  {int(meals):>4}{cal:>12.1f}  {'Exceeded Limit' if cal > limit else 'Within Limit'}"
+        for day, cal, meals in zip(user_daily.index, user_daily["calories"], user_daily["meals"])
+    )
+    lines += [
+        "",
+        f"Total Calories: {summary_row.total_calories:.1f}",
+        f"Average per Day: {summary_row.avg_per_day:.2f}",
+        f"Average per Meal: {summary_row.avg_per_meal:.2f}",
+        f"Limit: {limit}",
+        f"Days Over Limit: {int(summary_row.days_over_limit)} of {int(summary_row.days)}",
+    ]
+    path = Path(out_dir) / f"{_safe_filename(user)}.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def write_reports(daily, summary, limit, out_dir="reports", workers=None):
+    """Write one report per user concurrently; returns the written paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    per_user = {user: frame.droplevel("user") for user, frame in daily.groupby(level="user")}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(write_user_report, user, row, per_user[user], limit, out_dir)
+            for user, row in summary.iterrows()
+        ]
+        return [f.result() for f in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import food-diary exports")
+    parser.add_argument("files", nargs="+", help="CSV files with user,date,meal,calories")
+    parser.add_argument("--limit", type=float, default=2000.0, help="daily calorie limit")
+    parser.add_argument("--out-dir", default="reports", help="directory for per-user reports")
+    parser.add_argument("--summary", default="calorie_summary.csv", help="per-user summary CSV")
+    parser.add_argument("--db", help="also append the meals to this calorie_store database")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="report writer threads")
+    args = parser.parse_args(argv)
+
+    store = CalorieStore(args.db) if args.db else None
+    try:
+        daily = daily_totals(args.files, args.chunk_size, store)
+    finally:
+        if store is not None:
+            store.close()
+
+    if daily.empty:
+        logging.error("No valid meals found.")
+        return 1
+
+    summary = user_summary(daily, args.limit)
+    summary.to_csv(args.summary)
+    paths = write_reports(daily, summary, args.limit, args.out_dir, args.workers)
+    logging.info("Wrote %s and %d user reports to %s", args.summary, len(paths), args.out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
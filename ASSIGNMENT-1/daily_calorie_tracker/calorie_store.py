@@ -0,0 +1,188 @@
+"""Append-only SQLite store for the daily calorie tracker.
+
+Every meal is kept forever in the ``meals`` table, indexed by user and
+date. Daily and weekly totals are rolled up in the same transaction as
+the insert, so range questions like "average calories per day over the
+last year" read one row per day (or week) instead of every meal.
+"""
+
+import datetime as dt
+import json
+import sqlite3
+from collections import defaultdict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meals (
+    id        INTEGER PRIMARY KEY,
+    user      TEXT NOT NULL,
+    day       TEXT NOT NULL,
+    meal      TEXT NOT NULL,
+    calories  REAL NOT NULL,
+    logged_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meals_user_day ON meals (user, day);
+
+CREATE TABLE IF NOT EXISTS daily_totals (
+    user     TEXT NOT NULL,
+    day      TEXT NOT NULL,
+    calories REAL NOT NULL,
+    meals    INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS weekly_totals (
+    user       TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    calories   REAL NOT NULL,
+    meals      INTEGER NOT NULL,
+    days       INTEGER NOT NULL,
+    PRIMARY KEY (user, week_start)
+) WITHOUT ROWID;
+"""
+
+
+def _as_date(value):
+    if value is None:
+        return dt.date.today()
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value))
+
+
+def week_start(day):
+    """Monday of the ISO week containing ``day``."""
+    day = _as_date(day)
+    return day - dt.timedelta(days=day.weekday())
+
+
+class CalorieStore:
+    """Meal log keyed by user and date with precomputed rollups."""
+
+    def __init__(self, path="calorie_log.db"):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def add_meal(self, user, meal, calories, day=None):
+        return self.add_meals([(user, day, meal, calories)])
+
+    def add_meals(self, rows):
+        """Append ``(user, day, meal, calories)`` rows in one transaction.
+
+        Returns the number of meals stored.
+        """
+        now = dt.datetime.now().isoformat(timespec="seconds")
+        records = []
+        daily = defaultdict(lambda: [0.0, 0])
+        for user, day, meal, calories in rows:
+            day = _as_date(day).isoformat()
+            calories = float(calories)
+            records.append((user, day, meal, calories, now))
+            totals = daily[(user, day)]
+            totals[0] += calories
+            totals[1] += 1
+
+        if not records:
+            return 0
+
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO meals (user, day, meal, calories, logged_at) VALUES (?, ?, ?, ?, ?)",
+                records,
+            )
+            self._roll_up(daily)
+        return len(records)
+
+    def _roll_up(self, daily):
+        # One query for the whole batch: which (user, day) keys already
+        # have a daily row, i.e. do not add a new day to their week.
+        existing = set(self._db.execute(
+            """SELECT t.user, t.day FROM json_each(?) AS k
+               JOIN daily_totals AS t
+                 ON t.user = json_extract(k.value, '$[0]') AND t.day = json_extract(k.value, '$[1]')""",
+            (json.dumps(list(daily)),),
+        ))
+
+        self._db.executemany(
+            """INSERT INTO daily_totals (user, day, calories, meals) VALUES (?, ?, ?, ?)
+               ON CONFLICT (user, day) DO UPDATE SET
+                   calories = calories + excluded.calories,
+                   meals = meals + excluded.meals""",
+            [(user, day, cal, n) for (user, day), (cal, n) in daily.items()],
+        )
+
+        weekly = defaultdict(lambda: [0.0, 0, 0])
+        for (user, day), (cal, n) in daily.items():
+            totals = weekly[(user, week_start(day).isoformat())]
+            totals[0] += cal
+            totals[1] += n
+            totals[2] += (user, day) not in existing
+        self._db.executemany(
+            """INSERT INTO weekly_totals (user, week_start, calories, meals, days) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (user, week_start) DO UPDATE SET
+                   calories = calories + excluded.calories,
+                   meals = meals + excluded.meals,
+                   days = days + excluded.days""",
+            [(user, week, cal, n, d) for (user, week), (cal, n, d) in weekly.items()],
+        )
+
+    def meals(self, user, start=None, end=None):
+        """Meals for ``user`` between ``start`` and ``end`` (inclusive dates)."""
+        start, end = self._range(start, end)
+        return self._db.execute(
+            "SELECT day, meal, calories FROM meals WHERE user = ? AND day BETWEEN ? AND ? ORDER BY day, id",
+            (user, start, end),
+        ).fetchall()
+
+    def daily_totals(self, user, start=None, end=None):
+        start, end = self._range(start, end)
+        return self._db.execute(
+            "SELECT day, calories, meals FROM daily_totals WHERE user = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (user, start, end),
+        ).fetchall()
+
+    def weekly_totals(self, user, start=None, end=None):
+        start, end = self._range(start, end)
+        return self._db.execute(
+            """SELECT week_start, calories, meals, days FROM weekly_totals
+               WHERE user = ? AND week_start BETWEEN ? AND ? ORDER BY week_start""",
+            (user, week_start(start).isoformat(), end),
+        ).fetchall()
+
+    def average_daily_calories(self, user, start=None, end=None):
+        """Average calories per logged day, read from the daily rollup."""
+        start, end = self._range(start, end)
+        total, days = self._db.execute(
+            "SELECT SUM(calories), COUNT(*) FROM daily_totals WHERE user = ? AND day BETWEEN ? AND ?",
+            (user, start, end),
+        ).fetchone()
+        return total / days if days else 0.0
+
+    def days_over_limit(self, user, limit, start=None, end=None):
+        start, end = self._range(start, end)
+        return self._db.execute(
+            "SELECT COUNT(*) FROM daily_totals WHERE user = ? AND day BETWEEN ? AND ? AND calories > ?",
+            (user, start, end, float(limit)),
+        ).fetchone()[0]
+
+    def users(self):
+        return [row[0] for row in self._db.execute("SELECT DISTINCT user FROM daily_totals ORDER BY user")]
+
+    @staticmethod
+    def _range(start, end):
+        start = _as_date(start).isoformat() if start is not None else "0001-01-01"
+        end = _as_date(end).isoformat() if end is not None else "9999-12-31"
+        return start, end
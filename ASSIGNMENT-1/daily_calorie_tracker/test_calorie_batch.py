@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from calorie_batch import iter_meal_chunks
+
+
+class MealChunkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "diary.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_invalid_rows_are_counted_and_dropped(self):
+        with open(self.path, "w") as fh:
+            fh.write("user,date,meal,calories\n"
+                     "ann,2025-01-01,rice,500\n"
+                     "ann,2025-01-01,cake,inf\n"
+                     "ann,2025-01-01,soup,-inf\n"
+                     "ann,2025-01-01,tea,-5\n"
+                     "ann,2025-01-01,water,\n"
+                     " ,2025-01-01,dal,200\n"
+                     "ann,not a date,roti,150\n"
+                     "ann,2025-01-02,egg,80,extra,field\n")
+        stats = {}
+        frames = list(iter_meal_chunks(self.path, chunk_size=3, stats=stats))
+        meals = [meal for frame in frames for meal in frame["meal"]]
+        self.assertEqual(meals, ["RICE"])
+        self.assertEqual(stats, {"rows": 7, "bad_rows": 6, "bad_lines": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
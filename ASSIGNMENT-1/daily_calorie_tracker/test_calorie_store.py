@@ -0,0 +1,78 @@
+import datetime as dt
+import os
+import tempfile
+import unittest
+
+from calorie_store import CalorieStore, week_start
+
+
+class CalorieStoreRollupTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CalorieStore(os.path.join(self.tmp.name, "log.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_week_start_is_monday(self):
+        self.assertEqual(week_start("2024-01-07"), dt.date(2024, 1, 1))  # Sunday
+        self.assertEqual(week_start("2024-01-08"), dt.date(2024, 1, 8))  # Monday
+
+    def test_daily_totals_sum_meals_per_day(self):
+        self.store.add_meals([
+            ("ann", "2024-01-01", "OATS", 300),
+            ("ann", "2024-01-01", "RICE", 500),
+            ("ann", "2024-01-02", "SOUP", 250),
+            ("bob", "2024-01-01", "PIZZA", 900),
+        ])
+        self.assertEqual(self.store.daily_totals("ann"),
+                         [("2024-01-01", 800.0, 2), ("2024-01-02", 250.0, 1)])
+        self.assertEqual(self.store.daily_totals("bob"), [("2024-01-01", 900.0, 1)])
+
+    def test_later_batches_add_to_existing_rollups(self):
+        self.store.add_meals([("ann", "2024-01-01", "OATS", 300)])
+        self.store.add_meals([("ann", "2024-01-01", "RICE", 500),
+                              ("ann", "2024-01-03", "SOUP", 250)])
+        self.store.add_meal("ann", "TEA", 50, day="2024-01-03")
+
+        self.assertEqual(self.store.daily_totals("ann"),
+                         [("2024-01-01", 800.0, 2), ("2024-01-03", 300.0, 2)])
+        # Two distinct days in the week of 2024-01-01, however many batches.
+        self.assertEqual(self.store.weekly_totals("ann"), [("2024-01-01", 1100.0, 4, 2)])
+
+    def test_weekly_totals_split_on_monday(self):
+        self.store.add_meals([
+            ("ann", "2024-01-07", "OATS", 400),  # Sunday
+            ("ann", "2024-01-08", "RICE", 600),  # Monday
+        ])
+        self.assertEqual(self.store.weekly_totals("ann"),
+                         [("2024-01-01", 400.0, 1, 1), ("2024-01-08", 600.0, 1, 1)])
+
+    def test_range_queries_read_the_daily_rollup(self):
+        self.store.add_meals([
+            ("ann", "2024-01-01", "OATS", 1000),
+            ("ann", "2024-01-02", "RICE", 2500),
+            ("ann", "2024-01-02", "CAKE", 500),
+            ("ann", "2024-01-05", "SOUP", 1500),
+        ])
+        self.assertAlmostEqual(self.store.average_daily_calories("ann"), 5500.0 / 3)
+        self.assertAlmostEqual(self.store.average_daily_calories("ann", "2024-01-02", "2024-01-05"), 2250.0)
+        self.assertEqual(self.store.days_over_limit("ann", 1200), 2)
+        self.assertEqual(self.store.average_daily_calories("nobody"), 0.0)
+
+    def test_rollups_match_the_meal_log(self):
+        self.store.add_meals([("ann", f"2024-02-{d:02d}", "MEAL", 100 * d) for d in range(1, 29)])
+        self.store.add_meals([("ann", f"2024-02-{d:02d}", "SNACK", 10) for d in range(1, 29, 3)])
+
+        meals = self.store.meals("ann")
+        daily = self.store.daily_totals("ann")
+        weekly = self.store.weekly_totals("ann")
+        self.assertAlmostEqual(sum(c for _, _, c in meals), sum(c for _, c, _ in daily))
+        self.assertAlmostEqual(sum(c for _, c, _ in daily), sum(c for _, c, _, _ in weekly))
+        self.assertEqual(sum(n for _, _, n in daily), len(meals))
+        self.assertEqual(sum(d for _, _, _, d in weekly), len(daily))
+
+
+if __name__ == "__main__":
+    unittest.main()
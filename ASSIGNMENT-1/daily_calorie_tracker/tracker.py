@@ -1,46 +1,114 @@
 import datetime as dt
 
-print("\033[1;33m" + "[======================= DAILY CALORIE TRACKER =======================]" + "\033[0m")
-print("\nNAME: Kartik | ROLL NO: 2501730166")
-print("DATE:", dt.datetime.now().strftime("%d/%m/%Y %H:%M:%S"))
-print()
-
-meals, cal = [], []
-num = int(input("HOW MANY MEALS YOU WANT TO ADD: "))
-limit = float(input("ENTER DAILY CALORIE LIMIT: "))
-print()
-
-for _ in range(num):
-    data = input("Enter meal and calories (comma separated): ").strip()
-    name, value = [x.strip() for x in data.split(',')]
-    meals.append(name.upper())
-    cal.append(float(value))
-
-print("\n\033[1;96m{:<5}{:<20}{:<15}\033[0m".format("No", "Meal", "Calories"))
-print("\033[1;96m" + "-" * 45 + "\033[0m")
-for i, (m, c) in enumerate(zip(meals, cal), 1):
-    print("\033[1;96m{:<5}{:<20}{:<15}\033[0m".format(i, m, c))
-print("\033[1;96m" + "-" * 45 + "\033[0m")
-
-total = sum(cal)
-avg = total / len(cal)
-print(f"\nTOTAL CALORIES: {total:.1f}")
-print(f"AVERAGE CALORIES/MEAL: {avg:.2f}\n")
-
-if total > limit:
-    print("ALERT: YOU EXCEEDED YOUR DAILY LIMIT.")
-else:
-    print("GOOD JOB: YOU ARE UNDER YOUR CALORIE LIMIT.")
-
-save = input("\nSave report? (yes/no): ").strip().lower()
-if save == "yes":
-    with open("calorie_log.txt", "w") as f:
+from calorie_store import CalorieStore
+
+USER = "Kartik"
+ROLL_NO = "2501730166"
+DB_FILE = "calorie_log.db"
+REPORT_FILE = "calorie_log.txt"
+
+
+def print_header(user=USER):
+    print("\033[1;33m" + "[======================= DAILY CALORIE TRACKER =======================]" + "\033[0m")
+    print(f"\nNAME: {user} | ROLL NO: {ROLL_NO}")
+    print("DATE:", dt.datetime.now().strftime("%d/%m/%Y %H:%M:%S"))
+    print()
+
+
+def read_meals(num):
+    meals, cal = [], []
+    while len(meals) < num:
+        data = input("Enter meal and calories (comma separated): ").strip()
+        try:
+            name, value = [x.strip() for x in data.rsplit(',', 1)]
+            value = float(value)
+        except ValueError:
+            print("Invalid entry. Use the format: meal, calories")
+            continue
+        meals.append(name.upper())
+        cal.append(value)
+    return meals, cal
+
+
+def print_table(meals, cal):
+    print("\n\033[1;96m{:<5}{:<20}{:<15}\033[0m".format("No", "Meal", "Calories"))
+    print("\033[1;96m" + "-" * 45 + "\033[0m")
+    for i, (m, c) in enumerate(zip(meals, cal), 1):
+        print("\033[1;96m{:<5}{:<20}{:<15}\033[0m".format(i, m, c))
+    print("\033[1;96m" + "-" * 45 + "\033[0m")
+
+
+def summarize(cal):
+    total = sum(cal)
+    avg = total / len(cal) if cal else 0.0
+    return total, avg
+
+
+def read_user():
+    return input(f"ENTER YOUR NAME [{USER}]: ").strip() or USER
+
+
+def save_report(meals, cal, limit, filename=REPORT_FILE, user=USER):
+    total, avg = summarize(cal)
+    with open(filename, "w") as f:
         f.write("===== DAILY CALORIE REPORT =====\n")
-        f.write(f"NAME: Kartik\nROLL: 2501730166\nDATE: {dt.datetime.now()}\n\n")
+        f.write(f"NAME: {user}\nROLL: {ROLL_NO}\nDATE: {dt.datetime.now()}\n\n")
         for i, (m, c) in enumerate(zip(meals, cal), 1):
             f.write(f"{i}. {m:<20} {c:<10}\n")
         f.write(f"\nTotal Calories: {total:.1f}\nAverage: {avg:.2f}\nLimit: {limit}\n")
         f.write("Status: {}\n".format("Exceeded Limit" if total > limit else "Within Limit"))
-    print("File saved successfully.")
-else:
-    print("File not saved.")
+
+
+def log_meals(meals, cal, user=USER, day=None, db_file=DB_FILE):
+    """Append today's meals to the persistent store and return it open."""
+    store = CalorieStore(db_file)
+    store.add_meals((user, day, m, c) for m, c in zip(meals, cal))
+    return store
+
+
+def print_history(store, user=USER, limit=None):
+    today = dt.date.today()
+    for label, days in (("LAST 7 DAYS", 7), ("LAST 365 DAYS", 365)):
+        start = today - dt.timedelta(days=days - 1)
+        avg = store.average_daily_calories(user, start, today)
+        line = f"{label}: AVERAGE {avg:.1f} CALORIES/DAY"
+        if limit is not None:
+            line += f", {store.days_over_limit(user, limit, start, today)} DAYS OVER LIMIT"
+        print(line)
+
+
+def main():
+    user = read_user()
+    print_header(user)
+
+    num = int(input("HOW MANY MEALS YOU WANT TO ADD: "))
+    limit = float(input("ENTER DAILY CALORIE LIMIT: "))
+    print()
+
+    meals, cal = read_meals(num)
+    print_table(meals, cal)
+
+    total, avg = summarize(cal)
+    print(f"\nTOTAL CALORIES: {total:.1f}")
+    print(f"AVERAGE CALORIES/MEAL: {avg:.2f}\n")
+
+    if total > limit:
+        print("ALERT: YOU EXCEEDED YOUR DAILY LIMIT.")
+    else:
+        print("GOOD JOB: YOU ARE UNDER YOUR CALORIE LIMIT.")
+
+    # The meal history is always kept; the prompt is only for the text report.
+    with log_meals(meals, cal, user=user) as store:
+        print()
+        print_history(store, user=user, limit=limit)
+
+    save = input("\nSave report? (yes/no): ").strip().lower()
+    if save == "yes":
+        save_report(meals, cal, limit, user=user)
+        print("File saved successfully.")
+    else:
+        print("File not saved.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Multi-course gradebook built on ``gradebook_engine``.
+
+Reads either several ``Name,Marks`` course files or one wide CSV with a
+column per subject, aligns the students into a ``students x courses``
+matrix and computes per-course statistics in parallel worker processes.
+Each course can have its own grading scheme and weight; results are
+written as columnar ``.npz`` archives.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gradebook_engine import (
+    GRADE_BOUNDARIES, GRADE_LABELS, PASS_MARK,
+    DuplicateStudentError, GradeStats, grade_scores, iter_csv_chunks, resolve_duplicates,
+)
+
+# A student x course matrix holds one row per student, so "keep" is not offered.
+MATRIX_POLICIES = ("first", "last", "error")
+
+# Below this many marks the work is cheaper than starting worker processes.
+PARALLEL_MIN_CELLS = 1_000_000
+
+
+class GradingScheme:
+    """Grade boundaries, labels and pass mark for one course."""
+
+    def __init__(self, boundaries=GRADE_BOUNDARIES, labels=GRADE_LABELS, pass_mark=PASS_MARK, weight=1.0):
+        self.boundaries = np.asarray(boundaries, dtype=np.float64)
+        self.labels = np.asarray(labels)
+        self.pass_mark = float(pass_mark)
+        self.weight = float(weight)
+        if len(self.labels) != len(self.boundaries) + 1:
+            raise ValueError("A grading scheme needs one more label than boundaries.")
+        if np.any(np.diff(self.boundaries) <= 0):
+            raise ValueError("Grade boundaries must be strictly ascending.")
+
+    @classmethod
+    def from_dict(cls, spec):
+        """Build a scheme from ``{"grades": {"A": 90, ..., "F": 0}, "pass_mark": 40, "weight": 1}``."""
+        kwargs = {}
+        if "grades" in spec:
+            # Sorted by lower bound; the lowest grade has no boundary of its own.
+            ordered = sorted(spec["grades"].items(), key=lambda kv: kv[1])
+            kwargs["labels"] = [label for label, _ in ordered]
+            kwargs["boundaries"] = [bound for _, bound in ordered[1:]]
+        if "pass_mark" in spec:
+            kwargs["pass_mark"] = spec["pass_mark"]
+        if "weight" in spec:
+            kwargs["weight"] = spec["weight"]
+        return cls(**kwargs)
+
+    def grade(self, scores):
+        return grade_scores(scores, self.boundaries, self.labels)
+
+
+def load_schemes(config_file):
+    """Read ``{"default": {...}, "courses": {"MATHS": {...}}}`` from JSON.
+
+    Each course entry is applied over the default entry, so a course that
+    only sets its ``weight`` still uses the default grades and pass mark.
+    """
+    with open(config_file) as fh:
+        config = json.load(fh)
+    if not isinstance(config, dict):
+        raise ValueError(f"{config_file}: expected a JSON object.")
+    default_spec = config.get("default", {})
+    course_specs = config.get("courses", {})
+    if not isinstance(default_spec, dict) or not isinstance(course_specs, dict) \
+            or not all(isinstance(spec, dict) for spec in course_specs.values()):
+        raise ValueError(f"{config_file}: 'default' and every course entry must be JSON objects.")
+    default = GradingScheme.from_dict(default_spec)
+    courses = {name.upper(): GradingScheme.from_dict({**default_spec, **spec})
+               for name, spec in course_specs.items()}
+    return default, courses
+
+
+def course_name_from_filename(path):
+    return Path(path).stem.upper()
+
+
+def _check_policy(duplicates):
+    if duplicates not in MATRIX_POLICIES:
+        raise ValueError(f"Duplicate policy must be one of {', '.join(MATRIX_POLICIES)}, not '{duplicates}'.")
+
+
+def load_course_files(paths, chunk_size=100_000, duplicates="last"):
+    """Return ``({course: (names, scores)}, {course: duplicate names})`` for ``Name,Marks`` files.
+
+    ``duplicates`` is ``first``, ``last`` or ``error`` (see ``resolve_duplicates``).
+    """
+    _check_policy(duplicates)
+    courses = {}
+    repeated = {}
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Error: File '{path}' not found.")
+            continue
+        chunks = list(iter_csv_chunks(path, chunk_size))
+        if not chunks:
+            continue
+        course = course_name_from_filename(path)
+        names = np.concatenate([n for n, _ in chunks])
+        scores = np.concatenate([s for _, s in chunks])
+        names, scores, dups = resolve_duplicates(names, scores, duplicates)
+        courses[course] = (names, scores)
+        if dups:
+            repeated[course] = dups
+    return courses, repeated
+
+
+def load_wide_csv(filename, chunk_size=100_000, duplicates="last"):
+    """Read ``Name,Subject1,Subject2,...`` into ``(names, courses, matrix, duplicates)``.
+
+    Blank, non-numeric or non-finite marks become ``NaN`` (student not
+    enrolled). Repeated names are resolved row-wise with ``duplicates``.
+    """
+    _check_policy(duplicates)
+    header = [c.strip() for c in pd.read_csv(filename, nrows=0).columns]
+    if len(header) < 2:
+        raise ValueError("Wide CSV needs a Name column and at least one subject column.")
+    courses = [c.upper() for c in header[1:]]
+    width = len(courses)
+
+    name_chunks = []
+    mark_chunks = []
+    reader = pd.read_csv(
+        filename, chunksize=chunk_size, header=0, names=["name", *range(width)],
+        dtype={"name": str}, keep_default_na=False, na_values=[""], on_bad_lines="skip",
+    )
+    for chunk in reader:
+        names = chunk.pop("name").fillna("").str.strip()
+        chunk = chunk[(names != "").to_numpy()]
+        # Clean columns arrive as floats from the C parser; only columns
+        # holding text need the coercing pass.
+        block = np.empty((len(chunk), width))
+        for j in range(width):
+            block[:, j] = pd.to_numeric(chunk[j], errors="coerce")
+        block[~np.isfinite(block)] = np.nan
+        name_chunks.append(names[names != ""].to_numpy(dtype=object))
+        mark_chunks.append(block)
+
+    if not name_chunks:
+        return np.array([], dtype=object), courses, np.empty((0, width)), []
+    names, matrix = np.concatenate(name_chunks), np.vstack(mark_chunks)
+    # Resolve on row numbers so the whole row follows the kept name.
+    names, rows, dups = resolve_duplicates(names, np.arange(names.size), duplicates)
+    return names, courses, matrix[rows], dups
+
+
+def align_courses(courses):
+    """Merge per-course ``(names, scores)`` into one ``students x courses`` matrix."""
+    course_names = list(courses)
+    if not course_names:
+        return np.array([], dtype=object), course_names, np.empty((0, 0))
+
+    all_names = np.unique(np.concatenate([names for names, _ in courses.values()]))
+    matrix = np.full((all_names.size, len(course_names)), np.nan)
+    for j, course in enumerate(course_names):
+        names, scores = courses[course]
+        matrix[np.searchsorted(all_names, names), j] = scores
+    return all_names, course_names, matrix
+
+
+def top_k(names, scores, k):
+    """Return the ``k`` best ``(name, score)`` pairs using partial selection."""
+    k = min(k, scores.size)
+    if k <= 0:
+        return []
+    idx = np.argpartition(-scores, k - 1)[:k]
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [(str(names[i]), float(scores[i])) for i in idx]
+
+
+def course_statistics(course, names, scores, scheme, k=5):
+    """Statistics, grades and percentile ranks for a single course column.
+
+    ``names``/``scores`` may contain ``NaN`` scores for students who did
+    not take the course; these are excluded from every statistic.
+    """
+    enrolled = ~np.isnan(scores)
+    taken_names = names[enrolled]
+    taken = scores[enrolled]
+
+    stats = GradeStats(scheme.boundaries, scheme.labels, scheme.pass_mark).update(taken_names, taken)
+
+    grades = np.full(scores.size, "", dtype=scheme.labels.dtype)
+    grades[enrolled] = scheme.grade(taken)
+
+    # Percentile = share of the class at or below the score. Rank 1 is the
+    # best score; tied students share the better rank.
+    ordered = np.sort(taken)
+    at_or_below = np.searchsorted(ordered, taken, side="right")
+    percentile = np.full(scores.size, np.nan)
+    rank = np.zeros(scores.size, dtype=np.int64)
+    if taken.size:
+        percentile[enrolled] = at_or_below / taken.size * 100.0
+        rank[enrolled] = taken.size - at_or_below + 1
+
+    summary = {
+        "course": course,
+        "students": stats.count,
+        "average": stats.average,
+        "std": float(taken.std()) if taken.size else 0.0,
+        "median": float(np.median(taken)) if taken.size else 0.0,
+        "min": stats.min_score,
+        "max": stats.max_score,
+        "passed": stats.passed,
+        "failed": stats.failed,
+        "distribution": stats.distribution,
+        "top": top_k(taken_names, taken, k),
+    }
+    return summary, grades, percentile, rank
+
+
+# Set once per worker process by the pool initializer, so each task only
+# ships its own score column instead of the whole names array.
+_worker_names = None
+
+
+def _init_worker(names):
+    global _worker_names
+    _worker_names = names
+
+
+def _course_task(args):
+    course, scores, scheme, k = args
+    return course_statistics(course, _worker_names, scores, scheme, k)
+
+
+class CourseGradebook:
+    """Students x courses mark matrix with per-course schemes and weights."""
+
+    def __init__(self, names, courses, matrix, default_scheme=None, schemes=None, duplicates=None):
+        self.names = np.asarray(names, dtype=object)
+        self.courses = list(courses)
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        default_scheme = default_scheme or GradingScheme()
+        schemes = schemes or {}
+        self.schemes = {c: schemes.get(c, default_scheme) for c in self.courses}
+        # ``{course: names}`` that occurred more than once in the input
+        # (``{"*": names}`` for a wide CSV, where whole rows repeat).
+        self.duplicates = duplicates or {}
+
+    @classmethod
+    def from_course_files(cls, paths, default_scheme=None, schemes=None, duplicates="last"):
+        courses, repeated = load_course_files(paths, duplicates=duplicates)
+        names, course_names, matrix = align_courses(courses)
+        return cls(names, course_names, matrix, default_scheme, schemes, repeated)
+
+    @classmethod
+    def from_wide_csv(cls, filename, default_scheme=None, schemes=None, duplicates="last"):
+        names, courses, matrix, repeated = load_wide_csv(filename, duplicates=duplicates)
+        return cls(names, courses, matrix, default_scheme, schemes, {"*": repeated} if repeated else None)
+
+    def weights(self):
+        return np.array([self.schemes[c].weight for c in self.courses])
+
+    def weighted_totals(self):
+        """Weighted average over the courses each student actually took."""
+        w = self.weights()
+        taken = ~np.isnan(self.matrix)
+        weight_sum = (taken * w).sum(axis=1)
+        totals = np.nansum(self.matrix * w, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(weight_sum > 0, totals / weight_sum, np.nan)
+
+    def analyze(self, k=5, workers=None):
+        """Compute every course's statistics, in parallel when ``workers != 1``.
+
+        Small gradebooks (under ``PARALLEL_MIN_CELLS`` marks) and single-CPU
+        machines are analyzed serially, since starting the pool would cost
+        more than the work itself.
+        """
+        workers = min(workers or os.cpu_count() or 1, len(self.courses))
+        if workers <= 1 or self.matrix.size < PARALLEL_MIN_CELLS:
+            results = [course_statistics(c, self.names, self.matrix[:, j], self.schemes[c], k)
+                       for j, c in enumerate(self.courses)]
+        else:
+            tasks = [(c, np.ascontiguousarray(self.matrix[:, j]), self.schemes[c], k)
+                     for j, c in enumerate(self.courses)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.names,)) as pool:
+                results = list(pool.map(_course_task, tasks))
+        return dict(zip(self.courses, results))
+
+    def write_results(self, out_prefix, results):
+        """Write ``<prefix>_students.npz`` and ``<prefix>_courses.npz`` column archives."""
+        totals = self.weighted_totals()
+        valid = ~np.isnan(totals)
+        overall_rank = np.zeros(totals.size, dtype=np.int64)
+        order = np.argsort(-totals[valid], kind="stable")
+        overall_rank[np.flatnonzero(valid)[order]] = np.arange(1, order.size + 1)
+
+        students = {"name": self.names.astype(str), "weighted_total": totals, "rank": overall_rank}
+        for j, course in enumerate(self.courses):
+            _, grades, percentile, rank = results[course]
+            students[f"{course}_marks"] = self.matrix[:, j]
+            students[f"{course}_grade"] = grades
+            students[f"{course}_percentile"] = percentile
+            students[f"{course}_rank"] = rank
+
+        summaries = [results[c][0] for c in self.courses]
+        course_cols = {
+            "course": np.array(self.courses, dtype=str),
+            "weight": self.weights(),
+        }
+        for key in ("students", "average", "std", "median", "min", "max", "passed", "failed"):
+            course_cols[key] = np.array([np.nan if s[key] is None else s[key] for s in summaries])
+
+        np.savez(f"{out_prefix}_students.npz", **students)
+        np.savez(f"{out_prefix}_courses.npz", **course_cols)
+        return f"{out_prefix}_students.npz", f"{out_prefix}_courses.npz"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-course gradebook analyzer")
+    parser.add_argument("files", nargs="+", help="course CSV files (Name,Marks) or one wide CSV with --wide")
+    parser.add_argument("--wide", action="store_true", help="treat the single input as Name,Subject1,Subject2,...")
+    parser.add_argument("--config", help="JSON file with grading schemes and weights")
+    parser.add_argument("--top", type=int, default=5, help="top-k students to show per course")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (1 = serial)")
+    parser.add_argument("--out", default="gradebook_results", help="output file prefix")
+    parser.add_argument("--duplicates", choices=MATRIX_POLICIES, default="last",
+                        help="which row to keep for a repeated name")
+    args = parser.parse_args(argv)
+    if args.wide and len(args.files) > 1:
+        parser.error("--wide takes exactly one CSV file")
+
+    try:
+        default_scheme, schemes = (load_schemes(args.config) if args.config else (None, None))
+        if args.wide:
+            book = CourseGradebook.from_wide_csv(args.files[0], default_scheme, schemes, args.duplicates)
+        else:
+            book = CourseGradebook.from_course_files(args.files, default_scheme, schemes, args.duplicates)
+    except (OSError, ValueError, DuplicateStudentError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if not book.courses:
+        print("No data loaded.")
+        return 1
+
+    for course, names in book.duplicates.items():
+        where = "" if course == "*" else f" in {course}"
+        print(f"Duplicate names{where} ({args.duplicates} kept): {', '.join(names[:10])}"
+              + (f" and {len(names) - 10} more" if len(names) > 10 else ""))
+
+    results = book.analyze(k=args.top, workers=args.workers)
+    for course in book.courses:
+        s = results[course][0]
+        print(f"\n--- {course} ({s['students']} students, weight {book.schemes[course].weight:g}) ---")
+        print(f"Average: {s['average']:.2f}  Median: {s['median']:.2f}  Std: {s['std']:.2f}")
+        print(f"Passed: {s['passed']}  Failed: {s['failed']}  Grades: {s['distribution']}")
+        print("Top: " + ", ".join(f"{n} ({v:g})" for n, v in s["top"]))
+
+    for path in book.write_results(args.out, results):
+        print(f"Saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,9 @@
 import csv
 import os
 
+from gradebook_engine import GradebookEngine, append_student_records
+from gradebook_report import export_report, paginate, select_rows, write_pages
+
 #Name Kartik         
 #Roll no 2501730166
 # Assignment 2 
@@ -52,29 +55,34 @@ def load_csv_data(filename):
         
     return marks
 
-def append_student_record(filename):
-    name = input("Enter new student name: ").strip()
-    if not name:
-        print("Name cannot be empty.")
-        return
+def append_student_record(filename, book=None):
+    records = []
+    print("Type 'done' to finish.")
 
-    try:
-        score = float(input("Enter marks: ").strip())
-    except ValueError:
-        print("Invalid marks.")
-        return
+    while True:
+        name = input("Enter new student name: ").strip()
+        if name.lower() == 'done':
+            break
+        if not name:
+            print("Name cannot be empty.")
+            continue
 
-    file_exists = os.path.exists(filename)
-    
-    with open(filename, 'a', newline='') as file:
-        writer = csv.writer(file)
-        
-        if not file_exists:
-            writer.writerow(['Name', 'Marks'])
-            
-        writer.writerow([name, score])
-        
-    print(f"Added {name} to {filename}.")
+        try:
+            score = float(input("Enter marks: ").strip())
+        except ValueError:
+            print("Invalid marks.")
+            continue
+
+        records.append((name, score))
+
+    if book is not None:
+        # The loaded gradebook takes the rows too; its statistics are
+        # updated from the new rows only.
+        added = book.append_to_csv(filename, [r[0] for r in records], [r[1] for r in records])
+    else:
+        added = append_student_records(filename, records)
+    print(f"Added {added} students to {filename}.")
+    return records
 
 def calculate_average(marks_dict):
     scores = list(marks_dict.values())
@@ -82,34 +90,6 @@ def calculate_average(marks_dict):
         return 0.0
     return sum(scores) / len(scores)
 
-def find_max_score(student_scores):
-    if not student_scores:
-        return
-        
-    max_score = -1
-    max_student = ""
-
-    for name, score in student_scores.items():
-        if score > max_score:
-            max_score = score
-            max_student = name
-            
-    print(f"HIGHEST SCORE: {max_score} by {max_student}")
-
-def find_min_score(student_scores):
-    if not student_scores:
-        return
-        
-    min_score = 101
-    min_student = ""
-
-    for name, score in student_scores.items():
-        if score < min_score:
-            min_score = score
-            min_student = name
-            
-    print(f"LOWEST SCORE:  {min_score} by {min_student}")
-
 def assign_grades(student_scores):
     grades = {}
     distribution = {"A": 0, "B": 0, "C": 0, "D": 0, "F": 0}
@@ -131,57 +111,92 @@ def assign_grades(student_scores):
         
     return grades, distribution
 
-def print_summary(student_scores, grades):
-    passed = [name for name, score in student_scores.items() if score >= 40]
-    failed = [name for name, score in student_scores.items() if score < 40]
-    
-    print("\n--- Class Statistics ---")
-    avg = calculate_average(student_scores)
-    print(f"Average Score: {avg:.2f}")
-    
-    find_max_score(student_scores)
-    find_min_score(student_scores)
-    
-    _, final_dist = assign_grades(student_scores)
-    print(f"Grade Counts:  {final_dist}")
-    
-    print(f"Passed: {len(passed)} students")
-    print(f"Failed: {len(failed)} students")
-    
-    print("\n" + "="*40)
-    print(f"{'Name':<20} | {'Marks':<10} | {'Grade':<5}")
-    print("-" * 40)
-    
-    for name, score in student_scores.items():
-        grade = grades[name]
-        print(f"{name:<20} | {score:<10.1f} | {grade:<5}")
-    print("="*40)
+def to_gradebook(student_scores):
+    # A dict holds one score per name, which the engine's 'last' policy keeps.
+    return GradebookEngine(list(student_scores), list(student_scores.values()), duplicates='last')
+
+def print_summary(book):
+    book.print_summary()
+
+    view = input("Show - all / top N / bottom N / grades (e.g. A,B) [all]: ")
+    write_pages(select_rows(book.rows(), **parse_view(view)))
+
+def parse_view(text):
+    """Turn 'top 10', 'bottom 5', 'A,B' or '' into select_rows() arguments."""
+    words = text.strip().lower().split()
+    if len(words) == 2 and words[0] in ('top', 'bottom') and words[1].isdigit():
+        return {words[0]: int(words[1])}
+    return {'grades': [g.strip() for g in text.split(',') if g.strip()]}
+
+def export_student_report(book):
+    filename = input("Report filename (.txt/.csv/.json/.html): ").strip()
+    if not filename:
+        print("Filename cannot be empty.")
+        return
+
+    grade_filter = input("Only grades (e.g. A,B) or blank for all: ").strip()
+    view = input("View - all / top N / bottom N (e.g. 'top 10'): ").strip().lower().split()
+    page = input("Page number (blank for every page): ").strip()
+
+    rows = select_rows(
+        book.rows(),
+        grades=[g.strip() for g in grade_filter.split(',') if g.strip()],
+        top=int(view[1]) if len(view) == 2 and view[0] == 'top' else None,
+        bottom=int(view[1]) if len(view) == 2 and view[0] == 'bottom' else None,
+    )
+    if page:
+        rows = paginate(rows, int(page), page_size=50)
+
+    count = export_report(rows, filename)
+    print(f"Wrote {count} rows to {filename}.")
 
 def main():
     print("\n=== GRADEBOOK ANALYZER ===")
+    last_book = None
+    last_file = None
     
     while True:
         print("\n1. Manual Entry")
         print("2. Load from CSV")
         print("3. Add Student to CSV")
-        print("4. Exit")
+        print("4. Export Report")
+        print("5. Exit")
         
-        choice = input("Select an option (1-4): ").strip()
-        student_scores = {}
+        choice = input("Select an option (1-5): ").strip()
+        book = None
+        source = None
 
         if choice == '1':
-            student_scores = get_manual_input()
+            book = to_gradebook(get_manual_input())
             
         elif choice == '2':
             filename = input("Enter CSV filename: ")
-            student_scores = load_csv_data(filename)
+            book = to_gradebook(load_csv_data(filename))
+            source = filename
             
         elif choice == '3':
             filename = input("Enter CSV filename: ")
-            append_student_record(filename)
-            student_scores = load_csv_data(filename)
+            if filename == last_file and last_book is not None:
+                # Same file as already loaded: add the new rows to it
+                # instead of re-reading the whole sheet.
+                append_student_record(filename, last_book)
+                book = last_book
+            else:
+                append_student_record(filename)
+                book = to_gradebook(load_csv_data(filename))
+            source = filename
             
         elif choice == '4':
+            if last_book is None:
+                print("No data loaded.")
+                continue
+            try:
+                export_student_report(last_book)
+            except (ValueError, OSError) as e:
+                print(f"Could not export report: {e}")
+            continue
+
+        elif choice == '5':
             print("Goodbye!")
             break
             
@@ -189,9 +204,10 @@ def main():
             print("Invalid choice. Try again.")
             continue
 
-        if student_scores:
-            final_grades, _ = assign_grades(student_scores)
-            print_summary(student_scores, final_grades)
+        if len(book):
+            last_book = book
+            last_file = source
+            print_summary(book)
         else:
             if choice in ['1', '2', '3']:
                 print("No data loaded.")
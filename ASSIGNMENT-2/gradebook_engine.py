@@ -0,0 +1,471 @@
+"""Vectorized gradebook engine for large mark sheets.
+
+Loads a ``Name,Marks`` CSV in chunks (parsed by pandas' C reader) into
+typed NumPy arrays and computes the class statistics (average, min/max,
+grade distribution, pass/fail) with array operations instead of
+per-student Python loops.
+"""
+
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+try:
+    from snapshot import fingerprint, load_snapshot, write_snapshot
+except ImportError:  # shared packages not installed: always parse the CSV
+    fingerprint = load_snapshot = write_snapshot = None
+
+SNAPSHOT_META = {"loader": "gradebook_engine", "columns": ["name", "marks"]}
+# Names are snapshotted as fixed-width text sized to the longest name, so
+# a single very long name would inflate every row; such sheets are not
+# snapshotted.
+SNAPSHOT_NAME_WIDTH = 64
+
+# Lower bound of every grade above F, in ascending order.
+GRADE_BOUNDARIES = np.array([60.0, 70.0, 80.0, 90.0])
+GRADE_LABELS = np.array(["F", "D", "C", "B", "A"])
+PASS_MARK = 40.0
+
+DUPLICATE_POLICIES = ("keep", "first", "last", "error")
+
+
+class DuplicateStudentError(Exception): pass
+
+
+def grade_scores(scores, boundaries=GRADE_BOUNDARIES, labels=GRADE_LABELS):
+    """Return the letter grade of every score using a binned lookup."""
+    return labels[np.searchsorted(boundaries, scores, side="right")]
+
+
+class GradeStats:
+    """Class statistics that can be built from, and extended with, score arrays."""
+
+    def __init__(self, boundaries=GRADE_BOUNDARIES, labels=GRADE_LABELS, pass_mark=PASS_MARK):
+        self.boundaries = np.asarray(boundaries, dtype=np.float64)
+        self.labels = np.asarray(labels)
+        self.pass_mark = float(pass_mark)
+        # The pass mark is folded into the bin edges so that one lookup
+        # yields both the grade and the pass/fail split.
+        self._edges = np.union1d(self.boundaries, [self.pass_mark])
+        self._bin_grade = np.searchsorted(self.boundaries, self._edges_lower(), side="right")
+        self._bin_passed = self._edges_lower() >= self.pass_mark
+        self._bins = np.zeros(len(self._edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max_score = None
+        self.max_student = ""
+        self.min_score = None
+        self.min_student = ""
+
+    def _edges_lower(self):
+        # Lowest score that falls into each bin.
+        return np.concatenate(([-np.inf], self._edges))
+
+    def update(self, names, scores):
+        """Fold a batch of rows into the running statistics."""
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.size == 0:
+            return self
+
+        self.count += scores.size
+        self.total += float(scores.sum())
+
+        hi = int(scores.argmax())
+        if self.max_score is None or scores[hi] > self.max_score:
+            self.max_score = float(scores[hi])
+            self.max_student = str(names[hi])
+
+        lo = int(scores.argmin())
+        if self.min_score is None or scores[lo] < self.min_score:
+            self.min_score = float(scores[lo])
+            self.min_student = str(names[lo])
+
+        bins = np.searchsorted(self._edges, scores, side="right")
+        self._bins += np.bincount(bins, minlength=len(self._bins))
+        return self
+
+    def remove(self, scores):
+        """Take rows back out of the running statistics.
+
+        Returns ``False`` when a removed row may have held the min or max;
+        the caller must then ``rescan_extremes`` over the remaining rows.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.size == 0:
+            return True
+
+        self.count -= scores.size
+        self.total -= float(scores.sum())
+        bins = np.searchsorted(self._edges, scores, side="right")
+        self._bins -= np.bincount(bins, minlength=len(self._bins))
+        return bool(scores.max() < self.max_score and scores.min() > self.min_score)
+
+    def rescan_extremes(self, names, scores):
+        """Recompute the min and max from every remaining row."""
+        self.max_score = self.min_score = None
+        self.max_student = self.min_student = ""
+        if np.size(scores):
+            hi, lo = int(np.argmax(scores)), int(np.argmin(scores))
+            self.max_score, self.max_student = float(scores[hi]), str(names[hi])
+            self.min_score, self.min_student = float(scores[lo]), str(names[lo])
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def distribution(self):
+        counts = np.bincount(self._bin_grade, weights=self._bins, minlength=len(self.labels))
+        return {str(label): int(n) for label, n in zip(self.labels[::-1], counts[::-1])}
+
+    @property
+    def passed(self):
+        return int(self._bins[self._bin_passed].sum())
+
+    @property
+    def failed(self):
+        return self.count - self.passed
+
+
+def _parse_chunk(chunk):
+    # Marks that are blank, non-numeric or non-finite (nan/inf) are
+    # skipped, like any other unparseable row.
+    scores = pd.to_numeric(chunk["marks"].str.strip(), errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(scores)
+    names = chunk["name"].str.strip().to_numpy(dtype=object)
+    return names[valid], scores[valid]
+
+
+def iter_csv_chunks(filename, chunk_size=100_000):
+    """Yield ``(names, scores)`` arrays of at most ``chunk_size`` rows each."""
+    try:
+        reader = pd.read_csv(
+            filename, chunksize=chunk_size, header=0, names=["name", "marks"],
+            usecols=[0, 1], dtype=str, keep_default_na=False, on_bad_lines="skip",
+        )
+        for chunk in reader:
+            yield _parse_chunk(chunk)
+    except pd.errors.EmptyDataError:
+        return
+
+
+def resolve_duplicates(names, scores, policy="keep"):
+    """Apply a duplicate-name policy and return ``(names, scores, duplicates)``.
+
+    ``keep`` keeps every row, ``first``/``last`` keep one row per name and
+    ``error`` raises ``DuplicateStudentError``. ``duplicates`` lists the
+    names that occurred more than once.
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {policy}")
+    if names.size == 0:
+        return names, scores, []
+
+    unique, first_idx, counts = np.unique(names, return_index=True, return_counts=True)
+    duplicates = [str(n) for n in unique[counts > 1]]
+
+    if not duplicates or policy == "keep":
+        return names, scores, duplicates
+    if policy == "error":
+        raise DuplicateStudentError(f"Duplicate students: {', '.join(duplicates[:10])}")
+
+    if policy == "first":
+        keep = np.sort(first_idx)
+    else:
+        _, last_rev = np.unique(names[::-1], return_index=True)
+        keep = np.sort(names.size - 1 - last_rev)
+    return names[keep], scores[keep], duplicates
+
+
+def _finite_rows(names, scores):
+    names = np.asarray(names, dtype=object)
+    scores = np.asarray(scores, dtype=np.float64)
+    finite = np.isfinite(scores)
+    return names[finite], scores[finite]
+
+
+def _fsync_directory(path):
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def append_student_records(filename, records):
+    """Append ``(name, score)`` records to a mark sheet as one atomic batch.
+
+    The sheet is copied to a temporary file next to it, the batch is added
+    to the copy with a single write(), and the copy is fsync'd and renamed
+    over the sheet with ``os.replace``. After a crash the sheet therefore
+    holds either none or all of the batch, never part of a row. Writers
+    take an exclusive lock on ``<file>.lock`` (the rename replaces the
+    sheet itself, so it cannot carry the lock). Each call re-writes the
+    whole sheet, so add many students per call rather than one at a time.
+    """
+    records = list(records)
+    if not records:
+        return 0
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    payload = buffer.getvalue().encode()
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    with open(filename + ".lock", "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)  # released when the lock file closes
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w+b") as out:
+                try:
+                    with open(filename, "rb") as src:
+                        shutil.copyfileobj(src, out, 1 << 20)
+                    shutil.copymode(filename, tmp)
+                except FileNotFoundError:
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(tmp, 0o666 & ~umask)
+
+                if out.tell() == 0:
+                    payload = b"Name,Marks\r\n" + payload
+                else:
+                    out.seek(-1, os.SEEK_END)
+                    if out.read(1) not in (b"\n", b"\r"):
+                        payload = b"\n" + payload
+                out.write(payload)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, filename)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        _fsync_directory(directory)
+
+    return len(records)
+
+
+class GradebookEngine:
+    """Typed, array-backed gradebook with precomputed statistics.
+
+    Rows live in over-allocated arrays (``names``/``scores`` are views of
+    the filled part) and a name index is built on the first ``append``, so
+    appending costs time in proportion to the new rows, not the class.
+    ``finite=True`` promises that every score is already finite (as in a
+    snapshot of parsed rows), which skips the filter and its copies.
+    """
+
+    def __init__(self, names, scores, duplicates="keep", finite=False):
+        names = np.asarray(names)
+        if names.dtype.kind not in "OU":
+            names = names.astype(object)
+        scores = np.asarray(scores, dtype=np.float64)
+        if not finite:
+            keep = np.isfinite(scores)
+            names, scores = names[keep], scores[keep]
+        self._names, self._scores, self.duplicates = resolve_duplicates(names, scores, duplicates)
+        self._size = self._scores.size
+        self._owned = False  # the arrays may still be the caller's or a snapshot's
+        self._index = None
+        self.policy = duplicates
+        self.stats = GradeStats().update(self.names, self.scores)
+
+    @property
+    def names(self):
+        return self._names[:self._size]
+
+    @property
+    def scores(self):
+        return self._scores[:self._size]
+
+    @classmethod
+    def from_csv(cls, filename, chunk_size=100_000, duplicates="keep", snapshot=False, verify_hash=False):
+        """Load a mark sheet, optionally through a memory-mapped snapshot.
+
+        With ``snapshot`` (and the shared ``snapshot`` package installed)
+        the parsed rows are stored next to the CSV and reused on later
+        loads until the CSV's size or mtime changes; ``verify_hash`` also
+        compares a SHA-256 of the CSV, at the cost of reading it on every
+        load. Duplicate handling is applied after loading, so one snapshot
+        serves every policy.
+        """
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"File '{filename}' not found.")
+
+        snapshot = snapshot and load_snapshot is not None
+        if snapshot:
+            hit = load_snapshot(filename, verify_hash=verify_hash)
+            if hit is not None and hit[1] == SNAPSHOT_META:
+                columns = hit[0]
+                return cls(columns["name"], columns["marks"], duplicates, finite=True)
+            source_fingerprint = fingerprint(filename, with_hash=verify_hash)
+
+        name_chunks = []
+        score_chunks = []
+        for names, scores in iter_csv_chunks(filename, chunk_size):
+            name_chunks.append(names)
+            score_chunks.append(scores)
+
+        if score_chunks:
+            names, scores = np.concatenate(name_chunks), np.concatenate(score_chunks)
+        else:
+            names, scores = np.array([], dtype=object), np.array([], dtype=np.float64)
+
+        if snapshot:
+            width = max(map(len, names.tolist()), default=0)
+            if width > SNAPSHOT_NAME_WIDTH:
+                print(f"Not writing a snapshot: a name has {width} characters "
+                      f"(limit {SNAPSHOT_NAME_WIDTH}).")
+            else:
+                try:
+                    write_snapshot(filename, {"name": names.astype(f"U{max(width, 1)}"), "marks": scores},
+                                   SNAPSHOT_META, source_fingerprint=source_fingerprint)
+                except OSError as e:
+                    print(f"Could not write snapshot: {e}")
+        return cls(names, scores, duplicates, finite=True)
+
+    def _name_index(self):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names.tolist())}
+        return self._index
+
+    def _reserve(self, extra):
+        # Grow geometrically so that repeated appends copy each row O(1) times.
+        needed = self._size + extra
+        if self._owned and needed <= self._scores.size:
+            return
+        capacity = max(needed, 2 * self._size, 1024)
+        names = np.empty(capacity, dtype=object)
+        scores = np.empty(capacity, dtype=np.float64)
+        names[:self._size] = self.names
+        scores[:self._size] = self.scores
+        self._names, self._scores, self._owned = names, scores, True
+
+    def _check_batch(self, names, scores):
+        """Apply the policy within a batch and find the names already known.
+
+        Returns ``(names, scores, known)`` where ``known`` flags the rows
+        whose name is already in the gradebook.
+        """
+        index = self._name_index()
+        inner = "keep" if self.policy == "error" else self.policy
+        names, scores, in_batch = resolve_duplicates(names, scores, inner)
+        known = np.array([name in index for name in names.tolist()], dtype=bool)
+        repeated = [str(name) for name in names[known]]
+        if self.policy == "error" and (repeated or in_batch):
+            raise DuplicateStudentError(f"Duplicate students: {', '.join((repeated + in_batch)[:10])}")
+        self.duplicates = sorted(set(self.duplicates).union(repeated, in_batch))
+        return names, scores, known
+
+    def append(self, names, scores):
+        """Add rows in memory and update the statistics from those rows only.
+
+        Under ``last`` a known name gets its new score in place, like a
+        dict update; the old score is taken out of the statistics, and the
+        min/max are rescanned only if that score was one of them.
+        """
+        names, scores = _finite_rows(names, scores)
+        if names.size == 0:
+            return
+        names, scores, known = self._check_batch(names, scores)
+
+        if self.policy == "last" and known.any():
+            self._reserve(0)
+            index = self._name_index()
+            positions = np.array([index[name] for name in names[known].tolist()], dtype=np.intp)
+            exact = self.stats.remove(self._scores[positions])
+            self._scores[positions] = scores[known]
+            self.stats.update(names[known], scores[known])
+            if not exact:
+                self.stats.rescan_extremes(self.names, self.scores)
+        if self.policy in ("first", "last"):
+            names, scores = names[~known], scores[~known]
+        if names.size == 0:
+            return
+
+        self._reserve(names.size)
+        start, self._size = self._size, self._size + names.size
+        self._names[start:self._size] = names
+        self._scores[start:self._size] = scores
+        self._index.update(zip(names.tolist(), range(start, self._size)))
+        self.stats.update(names, scores)
+
+    def append_to_csv(self, filename, names, scores):
+        """Write rows to ``filename`` and add them to this gradebook.
+
+        The rows go to disk as one atomic batch (``append_student_records``)
+        and the statistics are then updated from those rows only, so the
+        sheet is never re-read. Under ``error`` a duplicate name is
+        reported before anything is written. Returns the rows written.
+        """
+        names, scores = _finite_rows(names, scores)
+        if self.policy == "error":
+            self._check_batch(names, scores)
+        written = append_student_records(filename, zip(names.tolist(), scores.tolist()))
+        self.append(names, scores)
+        return written
+
+    def __len__(self):
+        return self._size
+
+    def grades(self):
+        return grade_scores(self.scores, self.stats.boundaries, self.stats.labels)
+
+    def rows(self):
+        """Yield ``(name, score, grade)`` rows for ``gradebook_report``."""
+        return zip(self.names.tolist(), self.scores.tolist(), self.grades().tolist())
+
+    def to_dict(self):
+        """Return the ``{name: score}`` mapping used by ``gradebook.py``."""
+        return dict(zip(self.names.tolist(), self.scores.tolist()))
+
+    def print_summary(self):
+        s = self.stats
+        print("\n--- Class Statistics ---")
+        print(f"Students:      {s.count}")
+        print(f"Average Score: {s.average:.2f}")
+        if s.count:
+            print(f"HIGHEST SCORE: {s.max_score} by {s.max_student}")
+            print(f"LOWEST SCORE:  {s.min_score} by {s.min_student}")
+        print(f"Grade Counts:  {s.distribution}")
+        print(f"Passed: {s.passed} students")
+        print(f"Failed: {s.failed} students")
+        if self.duplicates:
+            print(f"Duplicate names ({self.policy}): {len(self.duplicates)}")
+
+
+def main(argv=None):
+    argv = argv or sys.argv[1:]
+
+    if len(argv) < 1:
+        print("Usage: python gradebook_engine.py <marks.csv> [keep|first|last|error]")
+        return 1
+
+    policy = argv[1] if len(argv) > 1 else "keep"
+    try:
+        book = GradebookEngine.from_csv(argv[0], duplicates=policy, snapshot=True)
+    except (FileNotFoundError, ValueError, DuplicateStudentError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Loaded {len(book)} students from {argv[0]}.")
+    book.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""Buffered report output for the gradebook.
+
+Rows are ``(name, score, grade)`` tuples, as produced by
+``GradebookEngine.rows``. Rows are formatted in batches and written with one
+``write()`` call per batch, so large reports are bound by I/O rather than
+by per-row ``print()`` calls.
+"""
+
+import csv
+import heapq
+import html
+import json
+import sys
+from itertools import islice
+
+BATCH_SIZE = 10_000
+FILE_BUFFER = 1 << 20
+PAGE_SIZE = 50
+
+
+def select_rows(rows, grades=None, top=None, bottom=None):
+    """Filter rows by grade and optionally keep only the top/bottom N by score.
+
+    Top/bottom selection uses a bounded heap, so only N rows are kept in
+    memory no matter how large the sheet is.
+    """
+    if grades:
+        wanted = {g.upper() for g in grades}
+        rows = (r for r in rows if r[2] in wanted)
+    if top is not None:
+        rows = iter(heapq.nlargest(top, rows, key=lambda r: r[1]))
+    elif bottom is not None:
+        rows = iter(heapq.nsmallest(bottom, rows, key=lambda r: r[1]))
+    return rows
+
+
+def paginate(rows, page=1, page_size=50):
+    """Return the rows of a 1-based page without materialising earlier pages."""
+    start = (page - 1) * page_size
+    return islice(rows, start, start + page_size)
+
+
+def _batches(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def write_table(rows, out=None):
+    out = out or sys.stdout
+    width = 40
+    out.write("\n" + "=" * width + "\n"
+              f"{'Name':<20} | {'Marks':<10} | {'Grade':<5}\n"
+              + "-" * width + "\n")
+    count = 0
+    for batch in _batches(rows):
+        out.write("".join(f"{name:<20} | {score:<10.1f} | {grade:<5}\n"
+                          for name, score, grade in batch))
+        count += len(batch)
+    out.write("=" * width + "\n")
+    return count
+
+
+def write_pages(rows, page_size=PAGE_SIZE, out=None, ask=None):
+    """Show the table one page at a time, asking before every further page.
+
+    Rows are consumed lazily, so stopping after the first page of a huge
+    sheet never formats the rest. Returns the number of rows shown.
+    """
+    ask = ask or input
+    count = 0
+    for page in _batches(rows, page_size):
+        if count and ask(f"Shown {count} rows. Press Enter for more, or q to stop: ").strip().lower() == "q":
+            break
+        count += write_table(page, out)
+    return count
+
+
+def write_csv(rows, out):
+    writer = csv.writer(out)
+    writer.writerow(["Name", "Marks", "Grade"])
+    count = 0
+    for batch in _batches(rows):
+        writer.writerows(batch)
+        count += len(batch)
+    return count
+
+
+def write_json(rows, out):
+    """Stream a JSON array of ``{"name", "marks", "grade"}`` objects."""
+    out.write("[")
+    count = 0
+    for batch in _batches(rows):
+        out.write(("," if count else "") + ",".join(
+            json.dumps({"name": name, "marks": score, "grade": grade})
+            for name, score, grade in batch))
+        count += len(batch)
+    out.write("]\n")
+    return count
+
+
+def write_html(rows, out, title="Gradebook Report"):
+    out.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+              f"<title>{html.escape(title)}</title></head><body>\n"
+              f"<h1>{html.escape(title)}</h1>\n<table>\n"
+              "<tr><th>Name</th><th>Marks</th><th>Grade</th></tr>\n")
+    count = 0
+    for batch in _batches(rows):
+        out.write("".join(
+            f"<tr><td>{html.escape(str(name))}</td><td>{score:.1f}</td><td>{grade}</td></tr>\n"
+            for name, score, grade in batch))
+        count += len(batch)
+    out.write("</table>\n</body></html>\n")
+    return count
+
+
+WRITERS = {
+    "table": write_table,
+    "csv": write_csv,
+    "json": write_json,
+    "html": write_html,
+}
+
+
+def export_report(rows, filename, fmt=None):
+    """Write rows to ``filename``; the format defaults to the file extension."""
+    fmt = (fmt or filename.rsplit(".", 1)[-1]).lower()
+    if fmt == "txt":
+        fmt = "table"
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    with open(filename, "w", newline="", encoding="utf-8", buffering=FILE_BUFFER) as out:
+        return WRITERS[fmt](rows, out)
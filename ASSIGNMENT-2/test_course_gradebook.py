@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import course_gradebook as cg
+from course_gradebook import CourseGradebook, GradingScheme, course_statistics, load_schemes, top_k
+from gradebook_engine import DuplicateStudentError
+
+NAN = float("nan")
+
+
+class CourseStatisticsTest(unittest.TestCase):
+    def test_rank_and_percentile_ties(self):
+        names = np.array(["a", "b", "c", "d", "e"], dtype=object)
+        scores = np.array([90.0, 70.0, 90.0, NAN, 50.0])
+        summary, grades, percentile, rank = course_statistics("X", names, scores, GradingScheme())
+
+        # Tied students share the better rank; the next rank skips.
+        self.assertEqual(rank.tolist(), [1, 3, 1, 0, 4])
+        np.testing.assert_allclose(percentile, [100.0, 50.0, 100.0, NAN, 25.0])
+        self.assertEqual(grades.tolist(), ["A", "C", "A", "", "F"])
+        self.assertEqual(summary["students"], 4)
+        self.assertEqual(summary["median"], 80.0)
+
+    def test_nobody_enrolled(self):
+        names = np.array(["a", "b"], dtype=object)
+        summary, grades, percentile, rank = course_statistics("X", names, np.array([NAN, NAN]), GradingScheme())
+        self.assertEqual(summary["students"], 0)
+        self.assertEqual(summary["top"], [])
+        self.assertEqual(rank.tolist(), [0, 0])
+        self.assertTrue(np.isnan(percentile).all())
+
+
+class TopKTest(unittest.TestCase):
+    names = np.array(["a", "b", "c", "d"], dtype=object)
+    scores = np.array([55.0, 91.0, 78.0, 91.0])
+
+    def test_best_first(self):
+        self.assertEqual(top_k(self.names, self.scores, 3), [("b", 91.0), ("d", 91.0), ("c", 78.0)])
+
+    def test_k_larger_than_class(self):
+        self.assertEqual(len(top_k(self.names, self.scores, 10)), 4)
+
+    def test_k_zero(self):
+        self.assertEqual(top_k(self.names, self.scores, 0), [])
+
+
+class WeightedTotalsTest(unittest.TestCase):
+    def test_only_taken_courses_count(self):
+        book = CourseGradebook(
+            ["a", "b", "c"], ["M", "P"],
+            [[80.0, 60.0], [90.0, NAN], [NAN, NAN]],
+            schemes={"M": GradingScheme(weight=3), "P": GradingScheme(weight=1)},
+        )
+        totals = book.weighted_totals()
+        self.assertAlmostEqual(totals[0], (80 * 3 + 60) / 4)
+        self.assertAlmostEqual(totals[1], 90.0)
+        self.assertTrue(np.isnan(totals[2]))
+
+
+class SchemeConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def config(self, data):
+        path = os.path.join(self.tmp.name, "schemes.json")
+        with open(path, "w") as fh:
+            fh.write(data if isinstance(data, str) else json.dumps(data))
+        return path
+
+    def test_course_entries_inherit_the_default(self):
+        default, courses = load_schemes(self.config({
+            "default": {"grades": {"A": 85, "B": 70, "F": 0}, "pass_mark": 50},
+            "courses": {"phys": {"weight": 2}, "chem": {"pass_mark": 30}},
+        }))
+        phys, chem = courses["PHYS"], courses["CHEM"]
+        self.assertEqual(phys.labels.tolist(), ["F", "B", "A"])
+        self.assertEqual((phys.weight, phys.pass_mark), (2.0, 50.0))
+        self.assertEqual(chem.boundaries.tolist(), [70.0, 85.0])
+        self.assertEqual((chem.weight, chem.pass_mark), (1.0, 30.0))
+        self.assertEqual(default.grade(np.array([84.0])).tolist(), ["B"])
+
+    def test_invalid_config(self):
+        for bad in ("{bad", "[1, 2]", '{"courses": {"phys": 2}}'):
+            with self.assertRaises(ValueError):
+                load_schemes(self.config(bad))
+        with self.assertRaises(ValueError):
+            load_schemes(self.config({"default": {"grades": {"A": 90, "B": 90, "F": 0}}}))
+
+
+class LoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def csv(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as fh:
+            fh.write(text)
+        return path
+
+    def test_wide_csv(self):
+        path = self.csv("wide.csv", "Name,Maths,Physics\nann,85,72\nbob,92,\n ,1,2\ncat,inf,abc\nann,60,61\n")
+        book = CourseGradebook.from_wide_csv(path)
+        self.assertEqual(book.courses, ["MATHS", "PHYSICS"])
+        rows = dict(zip(book.names.tolist(), book.matrix.tolist()))
+        self.assertEqual(rows["ann"], [60.0, 61.0])
+        self.assertTrue(np.isnan(rows["bob"][1]))
+        self.assertTrue(np.isnan(rows["cat"]).all())
+        self.assertEqual(book.duplicates, {"*": ["ann"]})
+
+        first = CourseGradebook.from_wide_csv(path, duplicates="first")
+        self.assertEqual(dict(zip(first.names.tolist(), first.matrix.tolist()))["ann"], [85.0, 72.0])
+        with self.assertRaises(DuplicateStudentError):
+            CourseGradebook.from_wide_csv(path, duplicates="error")
+        with self.assertRaises(ValueError):
+            CourseGradebook.from_wide_csv(path, duplicates="keep")
+
+    def test_course_files_are_aligned(self):
+        maths = self.csv("maths.csv", "Name,Marks\nann,80\nbob,70\nann,90\n")
+        physics = self.csv("physics.csv", "Name,Marks\nbob,55\ncat,65\n")
+        book = CourseGradebook.from_course_files([maths, physics])
+        self.assertEqual(book.names.tolist(), ["ann", "bob", "cat"])
+        np.testing.assert_array_equal(book.matrix, [[90.0, NAN], [70.0, 55.0], [NAN, 65.0]])
+        self.assertEqual(book.duplicates, {"MATHS": ["ann"]})
+
+    def test_parallel_matches_serial(self):
+        rng = np.random.default_rng(1)
+        matrix = rng.uniform(0, 100, (200, 3))
+        matrix[rng.random(matrix.shape) < 0.2] = NAN
+        book = CourseGradebook([f"s{i}" for i in range(200)], ["A", "B", "C"], matrix)
+        serial = book.analyze(k=5, workers=1)
+
+        threshold = cg.PARALLEL_MIN_CELLS
+        cg.PARALLEL_MIN_CELLS = 0
+        try:
+            parallel = book.analyze(k=5, workers=2)
+        finally:
+            cg.PARALLEL_MIN_CELLS = threshold
+        for course in book.courses:
+            self.assertEqual(serial[course][0], parallel[course][0])
+            for a, b in zip(serial[course][1:], parallel[course][1:]):
+                np.testing.assert_array_equal(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+import mmap
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import gradebook
+from gradebook_engine import (
+    DuplicateStudentError, GradebookEngine, GradeStats, append_student_records, load_snapshot,
+    resolve_duplicates,
+)
+
+STUDENT_CSV = Path(__file__).resolve().parent / "Student.csv"
+
+
+class GradeStatsTest(unittest.TestCase):
+    def test_pass_mark_between_boundaries(self):
+        # 65 is not a grade boundary; it must still split D into pass/fail.
+        stats = GradeStats(pass_mark=65).update(["a", "b", "c", "d"], [64.9, 65.0, 70.0, 95.0])
+        self.assertEqual(stats.passed, 3)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.distribution, {"A": 1, "B": 0, "C": 1, "D": 2, "F": 0})
+
+    def test_boundaries_are_inclusive(self):
+        stats = GradeStats().update(list("abcdef"), [39.9, 40, 60, 70, 80, 90])
+        self.assertEqual(stats.distribution, {"A": 1, "B": 1, "C": 1, "D": 1, "F": 2})
+        self.assertEqual((stats.passed, stats.failed), (5, 1))
+
+    def test_update_in_batches_matches_one_batch(self):
+        rng = np.random.default_rng(0)
+        scores = rng.uniform(0, 100, 1000)
+        names = np.array([f"s{i}" for i in range(scores.size)], dtype=object)
+        whole = GradeStats().update(names, scores)
+        parts = GradeStats()
+        for start in range(0, scores.size, 128):
+            parts.update(names[start:start + 128], scores[start:start + 128])
+        self.assertEqual(parts.distribution, whole.distribution)
+        self.assertEqual((parts.passed, parts.count), (whole.passed, whole.count))
+        self.assertAlmostEqual(parts.average, whole.average)
+        self.assertEqual((parts.max_student, parts.min_student), (whole.max_student, whole.min_student))
+
+
+class ParityTest(unittest.TestCase):
+    """The engine agrees with the dict-based statistics of ``gradebook.py``."""
+
+    def test_student_csv(self):
+        marks = gradebook.load_csv_data(str(STUDENT_CSV))
+        _, distribution = gradebook.assign_grades(marks)
+
+        # gradebook.py keeps the last row of a repeated name (dict update).
+        book = GradebookEngine.from_csv(STUDENT_CSV, duplicates="last")
+        s = book.stats
+        self.assertEqual(len(book), len(marks))
+        self.assertEqual(book.to_dict(), marks)
+        self.assertEqual(s.distribution, distribution)
+        self.assertAlmostEqual(s.average, gradebook.calculate_average(marks))
+        self.assertEqual(s.passed, sum(score >= 40 for score in marks.values()))
+        self.assertEqual(s.failed, sum(score < 40 for score in marks.values()))
+        self.assertEqual(s.max_score, max(marks.values()))
+        self.assertEqual(s.min_score, min(marks.values()))
+
+
+class CsvLoadingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def csv(self, text):
+        path = os.path.join(self.tmp.name, "marks.csv")
+        with open(path, "w") as fh:
+            fh.write(text)
+        return path
+
+    def test_non_finite_and_bad_marks_are_skipped(self):
+        path = self.csv("Name,Marks\nann,50\nbob,nan\ncat,inf\ndan,-inf\neve,\nfay,abc\ngus, 70 \n")
+        book = GradebookEngine.from_csv(path)
+        self.assertEqual(book.to_dict(), {"ann": 50.0, "gus": 70.0})
+        self.assertEqual(book.stats.distribution["A"], 0)
+
+    def test_empty_file(self):
+        self.assertEqual(len(GradebookEngine.from_csv(self.csv(""))), 0)
+        self.assertEqual(len(GradebookEngine.from_csv(self.csv("Name,Marks\n"))), 0)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            GradebookEngine.from_csv(os.path.join(self.tmp.name, "nope.csv"))
+
+    @unittest.skipIf(load_snapshot is None, "snapshot package not installed")
+    def test_snapshot_load_matches_parse(self):
+        path = self.csv("Name,Marks\nann,50\nbob,90\nann,70\n")
+        cold = GradebookEngine.from_csv(path, duplicates="last", snapshot=True)
+        self.assertIsNotNone(load_snapshot(path))
+        warm = GradebookEngine.from_csv(path, duplicates="first", snapshot=True)
+        self.assertEqual(cold.to_dict(), {"bob": 90.0, "ann": 70.0})
+        self.assertEqual(warm.to_dict(), {"ann": 50.0, "bob": 90.0})
+        self.assertEqual(warm.duplicates, ["ann"])
+
+        with open(path, "a") as fh:
+            fh.write("cat,30\n")
+        self.assertIsNone(load_snapshot(path))
+        self.assertEqual(len(GradebookEngine.from_csv(path, snapshot=True)), 4)
+
+    @unittest.skipIf(load_snapshot is None, "snapshot package not installed")
+    def test_warm_start_keeps_the_mapped_columns(self):
+        path = self.csv("Name,Marks\nann,50\nbob,90\n")
+        GradebookEngine.from_csv(path, snapshot=True)
+        warm = GradebookEngine.from_csv(path, snapshot=True)
+        # Views of the snapshot's maps, not copies of them.
+        for column in (warm.names, warm.scores):
+            while isinstance(column, np.ndarray) and column.base is not None:
+                column = column.base
+            self.assertIsInstance(column, mmap.mmap)
+
+    @unittest.skipIf(load_snapshot is None, "snapshot package not installed")
+    def test_long_names_are_not_snapshotted(self):
+        path = self.csv(f"Name,Marks\nann,50\n{'x' * 65},90\n")
+        book = GradebookEngine.from_csv(path, snapshot=True)
+        self.assertEqual(len(book), 2)
+        self.assertIsNone(load_snapshot(path))
+
+        path = self.csv(f"Name,Marks\nann,50\n{'x' * 64},90\n")
+        GradebookEngine.from_csv(path, snapshot=True)
+        self.assertEqual(load_snapshot(path)[0]["name"].dtype.str, "<U64")
+
+    @unittest.skipIf(load_snapshot is None, "snapshot package not installed")
+    def test_verify_hash_catches_same_size_and_mtime(self):
+        path = self.csv("Name,Marks\nann,50\n")
+        GradebookEngine.from_csv(path, snapshot=True, verify_hash=True)
+        st = os.stat(path)
+        with open(path, "w") as fh:
+            fh.write("Name,Marks\nann,90\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(GradebookEngine.from_csv(path, snapshot=True).to_dict(), {"ann": 50.0})
+        self.assertEqual(GradebookEngine.from_csv(path, snapshot=True, verify_hash=True).to_dict(), {"ann": 90.0})
+
+
+class DuplicatePolicyTest(unittest.TestCase):
+    names = np.array(["ann", "bob", "ann", "cat", "bob"], dtype=object)
+    scores = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+
+    def test_keep(self):
+        names, scores, dups = resolve_duplicates(self.names, self.scores, "keep")
+        self.assertEqual(names.tolist(), self.names.tolist())
+        self.assertEqual(dups, ["ann", "bob"])
+
+    def test_first(self):
+        names, scores, _ = resolve_duplicates(self.names, self.scores, "first")
+        self.assertEqual(dict(zip(names, scores)), {"ann": 10.0, "bob": 20.0, "cat": 40.0})
+
+    def test_last(self):
+        names, scores, _ = resolve_duplicates(self.names, self.scores, "last")
+        self.assertEqual(dict(zip(names, scores)), {"ann": 30.0, "cat": 40.0, "bob": 50.0})
+
+    def test_error(self):
+        with self.assertRaises(DuplicateStudentError):
+            resolve_duplicates(self.names, self.scores, "error")
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            resolve_duplicates(self.names, self.scores, "newest")
+
+
+class AppendTest(unittest.TestCase):
+    def book(self, policy):
+        return GradebookEngine(["ann", "bob"], [50.0, 95.0], duplicates=policy)
+
+    def assertStatsMatchRebuild(self, book):
+        fresh = GradeStats().update(book.names, book.scores)
+        self.assertEqual(book.stats.distribution, fresh.distribution)
+        self.assertEqual((book.stats.count, book.stats.passed), (fresh.count, fresh.passed))
+        self.assertAlmostEqual(book.stats.average, fresh.average)
+        self.assertEqual((book.stats.max_score, book.stats.min_score), (fresh.max_score, fresh.min_score))
+
+    def test_keep_adds_every_row(self):
+        book = self.book("keep")
+        book.append(["ann", "cat"], [30.0, 70.0])
+        self.assertEqual(len(book), 4)
+        self.assertEqual(book.duplicates, ["ann"])
+        self.assertStatsMatchRebuild(book)
+
+    def test_first_ignores_known_names(self):
+        book = self.book("first")
+        book.append(["ann", "cat", "cat"], [30.0, 70.0, 10.0])
+        self.assertEqual(book.to_dict(), {"ann": 50.0, "bob": 95.0, "cat": 70.0})
+        self.assertStatsMatchRebuild(book)
+
+    def test_last_replaces_known_names(self):
+        book = self.book("last")
+        book.append(["bob", "cat"], [20.0, 70.0])
+        self.assertEqual(book.to_dict(), {"ann": 50.0, "bob": 20.0, "cat": 70.0})
+        self.assertEqual(book.stats.max_student, "cat")
+        self.assertStatsMatchRebuild(book)
+
+    def test_error_rejects_the_batch(self):
+        book = self.book("error")
+        with self.assertRaises(DuplicateStudentError):
+            book.append(["cat", "ann"], [70.0, 30.0])
+        self.assertEqual(book.to_dict(), {"ann": 50.0, "bob": 95.0})
+        with self.assertRaises(DuplicateStudentError):
+            book.append(["dan", "dan"], [70.0, 30.0])
+
+    def test_non_finite_rows_are_dropped(self):
+        book = self.book("keep")
+        book.append(["cat", "dan"], [float("nan"), float("inf")])
+        self.assertEqual(len(book), 2)
+
+    def test_last_replacing_the_extremes(self):
+        book = self.book("last")
+        book.append(["bob", "ann"], [60.0, 55.0])
+        self.assertEqual(book.to_dict(), {"ann": 55.0, "bob": 60.0})
+        self.assertEqual((book.stats.max_student, book.stats.min_student), ("bob", "ann"))
+        self.assertStatsMatchRebuild(book)
+
+    def test_many_small_appends(self):
+        book = self.book("last")
+        for i in range(3000):
+            book.append([f"s{i % 2000}"], [float(i % 100)])
+        self.assertEqual(len(book), 2002)
+        self.assertEqual(book.to_dict()["s5"], 5.0)
+        self.assertEqual(book.to_dict()["s1999"], 99.0)
+        self.assertStatsMatchRebuild(book)
+
+    def test_caller_arrays_are_not_modified(self):
+        scores = np.array([50.0, 95.0])
+        book = GradebookEngine(np.array(["ann", "bob"], dtype=object), scores, duplicates="last")
+        book.append(["ann"], [10.0])
+        self.assertEqual(scores.tolist(), [50.0, 95.0])
+
+
+class AppendToCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "marks.csv")
+        with open(self.path, "w") as fh:
+            fh.write("Name,Marks\nann,50\nbob,95")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_file_and_statistics_agree(self):
+        book = GradebookEngine.from_csv(self.path, duplicates="last")
+        self.assertEqual(book.append_to_csv(self.path, ["cat", "bob"], [70.0, 20.0]), 2)
+        reloaded = GradebookEngine.from_csv(self.path, duplicates="last")
+        self.assertEqual(book.to_dict(), reloaded.to_dict())
+        self.assertEqual(book.stats.distribution, reloaded.stats.distribution)
+        self.assertAlmostEqual(book.stats.average, reloaded.stats.average)
+        self.assertEqual(gradebook.load_csv_data(self.path), reloaded.to_dict())
+
+    def test_new_file_gets_a_header(self):
+        path = os.path.join(self.tmp.name, "new.csv")
+        append_student_records(path, [("ann", 50.0)])
+        with open(path) as fh:
+            self.assertEqual(fh.read().splitlines(), ["Name,Marks", "ann,50.0"])
+
+    def test_duplicate_is_rejected_before_writing(self):
+        book = GradebookEngine.from_csv(self.path, duplicates="error")
+        with self.assertRaises(DuplicateStudentError):
+            book.append_to_csv(self.path, ["cat", "ann"], [70.0, 30.0])
+        self.assertEqual(len(GradebookEngine.from_csv(self.path)), 2)
+
+    def test_failed_write_leaves_the_sheet_untouched(self):
+        with open(self.path, "rb") as fh:
+            before = fh.read()
+        with mock.patch("gradebook_engine.os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                append_student_records(self.path, [("cat", 70.0), ("dan", 80.0)])
+        with open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), before)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["marks.csv", "marks.csv.lock"])
+
+
+if __name__ == "__main__":
+    unittest.main()
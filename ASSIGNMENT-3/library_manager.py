@@ -4,6 +4,11 @@ import json
 import logging
 from pathlib import Path
 
+try:
+    from snapshot import fingerprint, load_snapshot, write_snapshot
+except ImportError:  # shared packages not installed: always read the JSON archive
+    fingerprint = load_snapshot = write_snapshot = None
+
 # Logger Setup
 Path("logs").mkdir(exist_ok=True)
 logging.basicConfig(
@@ -64,11 +69,21 @@ class Book:
 
 
 class LibraryInventory:
-    """Inventory system storing books using ISBN keys"""
+    """Inventory system storing books using ISBN keys
+
+    With ``verify_hash`` the snapshot is also checked against a SHA-256 of
+    the archive, not just its size and modification time. This reads the
+    whole archive on every start, but catches edits that keep both.
+    """
 
-    def __init__(self, file="books.json"):
+    SNAPSHOT_META = {"loader": "library_manager", "version": 2}
+    SNAPSHOT_FIELDS = {"isbn": str, "title": str, "writer": str, "year": int, "state": str}
+
+    def __init__(self, file="books.json", use_snapshot=True, verify_hash=False):
         self._file = Path(file)
         self._store = {}
+        self._use_snapshot = use_snapshot and load_snapshot is not None
+        self._verify_hash = verify_hash
         self._load()
 
     def add_book(self, book: Book):
@@ -121,6 +136,12 @@ class LibraryInventory:
             log.info("No archive found. Creating new file.")
             return
 
+        if self._use_snapshot:
+            if self._load_snapshot():
+                log.info(f"Loaded {len(self._store)} entries from snapshot")
+                return
+            source_fingerprint = fingerprint(self._file, with_hash=self._verify_hash)
+
         try:
             data = json.load(self._file.open())
             for isbn, info in data.items():
@@ -131,6 +152,46 @@ class LibraryInventory:
             log.info(f"Loaded {len(self._store)} entries")
         except json.JSONDecodeError:
             log.error("Archive corrupted, starting fresh.")
+            return
+
+        if self._use_snapshot:
+            self._write_snapshot(source_fingerprint)
+
+    def _load_snapshot(self):
+        hit = load_snapshot(self._file, verify_hash=self._verify_hash)
+        if hit is None:
+            return False
+        cols, meta = hit
+        if {k: meta.get(k) for k in self.SNAPSHOT_META} != self.SNAPSHOT_META:
+            return False
+
+        encoded = set(meta.get("json_columns", []))
+        fields = []
+        for name in self.SNAPSHOT_FIELDS:
+            values = cols[name].tolist()
+            fields.append([json.loads(v) for v in values] if name in encoded else values)
+        for key, *info in zip(cols["key"].tolist(), *fields):
+            self._store[key] = Book(*info)
+        return True
+
+    def _write_snapshot(self, source_fingerprint):
+        records = [b.to_dict() for b in self._store.values()]
+        columns = {"key": list(self._store)}
+        encoded = []
+        for name, kind in self.SNAPSHOT_FIELDS.items():
+            values = [r[name] for r in records]
+            if all(type(v) is kind for v in values):
+                columns[name] = values
+            else:
+                # Values of other types (a missing year, a numeric ISBN)
+                # are stored as JSON text so they load back unchanged.
+                columns[name] = [json.dumps(v) for v in values]
+                encoded.append(name)
+        try:
+            write_snapshot(self._file, columns, dict(self.SNAPSHOT_META, json_columns=encoded),
+                           source_fingerprint=source_fingerprint)
+        except (OSError, TypeError, ValueError, OverflowError) as e:
+            log.error(f"Unable to write snapshot: {e}")
 
 
 # CLI SYSTEM
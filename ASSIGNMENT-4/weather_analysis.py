@@ -1,35 +1,20 @@
 import sys
 from typing import Tuple
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
+from timeseries_core import aggregate, bar_chart, line_chart, load_timeseries, save_figure
 
-def load_and_clean_data(file_path: str) -> pd.DataFrame:
+
+def load_and_clean_data(file_path: str, use_snapshot: bool = True) -> pd.DataFrame:
     """
     Loads a CSV file, converts the 'Date' column to datetime,
     sets it as the index, and fills missing numeric values using
     time-based linear interpolation.
+    The cleaned data is snapshotted next to the CSV, so later runs
+    memory-map it instead of re-parsing until the CSV changes.
     """
-    # Read file
-    data = pd.read_csv(file_path)
-
-    # Validate presence of Date column
-    if "Date" not in data.columns:
-        raise ValueError("Input CSV must contain a 'Date' column.")
-
-    # Convert date and set as index
-    data["Date"] = pd.to_datetime(data["Date"])
-    data = data.sort_values("Date").set_index("Date")
-
-    # Interpolate numeric fields
-    numeric_fields = data.select_dtypes(include=[np.number]).columns
-    if numeric_fields.any():
-        data[numeric_fields] = data[numeric_fields].interpolate(
-            method="linear", limit_direction="both"
-        )
-
-    return data
+    return load_timeseries(file_path, time_col="Date", interpolate=True, snapshot=use_snapshot)
 
 
 def analyze_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -45,17 +30,17 @@ def analyze_data(df: pd.DataFrame) -> pd.DataFrame:
         if col not in df.columns:
             raise ValueError(f"Missing required column: {col}")
 
-    # Monthly resampling
-    mean_temp = df["Temperature_C"].resample("ME").mean()
-    min_temp = df["Temperature_C"].resample("ME").min()
-    max_temp = df["Temperature_C"].resample("ME").max()
-    sum_rain = df["Rainfall_mm"].resample("ME").sum()
+    # Monthly resampling (one pass over the index for all four metrics)
+    stats = aggregate(df, "ME", {
+        "Temperature_C": ["mean", "min", "max"],
+        "Rainfall_mm": "sum",
+    })
 
     monthly = pd.DataFrame({
-        "MonthlyMeanTemp": mean_temp,
-        "MonthlyMinTemp": min_temp,
-        "MonthlyMaxTemp": max_temp,
-        "MonthlyTotalRainfall": sum_rain
+        "MonthlyMeanTemp": stats[("Temperature_C", "mean")],
+        "MonthlyMinTemp": stats[("Temperature_C", "min")],
+        "MonthlyMaxTemp": stats[("Temperature_C", "max")],
+        "MonthlyTotalRainfall": stats[("Rainfall_mm", "sum")]
     })
 
     return monthly
@@ -72,20 +57,16 @@ def create_visualizations(df_monthly: pd.DataFrame) -> Tuple[plt.Figure, plt.Axe
 
     # Mean temperature line chart
     fig_a, ax_a = plt.subplots(figsize=(10, 4))
-    ax_a.plot(df_monthly.index, df_monthly["MonthlyMeanTemp"],
-              linewidth=2, color="tab:red")
-    ax_a.set_title("Average Temperature by Month")
-    ax_a.set_xlabel("Month")
-    ax_a.set_ylabel("Temperature (°C)")
+    line_chart(ax_a, df_monthly.index, df_monthly["MonthlyMeanTemp"],
+               "Average Temperature by Month", "Month", "Temperature (°C)",
+               color="tab:red")
     fig_a.tight_layout()
 
     # Rainfall bar chart
     fig_b, ax_b = plt.subplots(figsize=(10, 4))
-    ax_b.bar(df_monthly.index, df_monthly["MonthlyTotalRainfall"],
-             width=20, color="tab:blue")
-    ax_b.set_title("Total Monthly Rainfall")
-    ax_b.set_xlabel("Month")
-    ax_b.set_ylabel("Rainfall (mm)")
+    bar_chart(ax_b, df_monthly.index, df_monthly["MonthlyTotalRainfall"],
+              "Total Monthly Rainfall", "Month", "Rainfall (mm)",
+              width=20, color="tab:blue")
     fig_b.tight_layout()
 
     # Combined plot
@@ -128,8 +109,7 @@ def main(argv=None):
     summary = analyze_data(df)
     fig, _ = create_visualizations(summary)
 
-    output_file = "weather_summary_plot.png"
-    fig.savefig(output_file, dpi=150)
+    output_file = save_figure(fig, "weather_summary_plot.png")
     print(f"Saved chart to {output_file}")
 
     return 0
@@ -5,6 +5,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from timeseries_core import aggregate, load_timeseries, save_figure
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 DATA_DIR = Path("data")
 OUTPUT_DIR = Path("output")
@@ -29,32 +31,20 @@ def ingest_and_validate_data() -> pd.DataFrame:
         return pd.DataFrame()
     for file_path in csv_files:
         try:
-            df = pd.read_csv(file_path, on_bad_lines="skip", low_memory=False)
+            df = load_timeseries(file_path, snapshot=True)
             if df.shape[1] < 1:
-                logging.warning("Skipping %s — no columns", file_path.name)
+                logging.warning("Skipping %s — no plausible kwh column", file_path.name)
                 continue
-            cols = [c.strip() for c in df.columns]
-            timestamp_col = None
             kwh_col = None
-            for c in cols:
-                lc = c.lower()
-                if 'time' in lc or 'date' in lc:
-                    timestamp_col = c
-                if lc in ('kwh', 'kw', 'energy', 'value'):
+            for c in df.columns:
+                if c.lower() in ('kwh', 'kw', 'energy', 'value'):
                     kwh_col = c
-            if timestamp_col is None:
-                timestamp_col = cols[0]
             if kwh_col is None:
-                if len(cols) > 1:
-                    kwh_col = cols[1]
-                else:
-                    logging.warning("Skipping %s — no plausible kwh column", file_path.name)
-                    continue
-            df = df[[timestamp_col, kwh_col]].rename(columns={timestamp_col: "Timestamp", kwh_col: "kwh"})
-            df["Building"] = safe_building_name_from_filename(file_path)
-            df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors="coerce")
+                kwh_col = df.columns[0]
+            df = df[[kwh_col]].rename(columns={kwh_col: "kwh"}).rename_axis("Timestamp")
             df["kwh"] = pd.to_numeric(df["kwh"], errors="coerce")
-            df = df.dropna(subset=["Timestamp", "kwh"])
+            df = df.dropna(subset=["kwh"])
+            df["Building"] = safe_building_name_from_filename(file_path)
             frames.append(df)
             logging.info("Ingested %d rows from %s", len(df), file_path.name)
         except Exception as exc:
@@ -62,22 +52,21 @@ def ingest_and_validate_data() -> pd.DataFrame:
     if not frames:
         logging.warning("No valid data ingested.")
         return pd.DataFrame()
-    combined = pd.concat(frames, ignore_index=True)
-    combined = combined.sort_values("Timestamp").set_index("Timestamp")
+    combined = pd.concat(frames).sort_index(kind="stable")
     logging.info("Combined dataframe has %d rows", len(combined))
     return combined
 
 def calculate_daily_totals(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["Timestamp", "Building", "Daily_kwh_Total"])
-    daily = df.groupby("Building")["kwh"].resample("D").sum()
+    daily = aggregate(df, "D", "sum", by="Building", column="kwh")
     daily = daily.reset_index().rename(columns={"kwh": "Daily_kwh_Total"})
     return daily
 
 def calculate_weekly_aggregates(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["Timestamp", "Building", "Weekly_kwh_Total"])
-    weekly = df.groupby("Building")["kwh"].resample("W").sum()
+    weekly = aggregate(df, "W", "sum", by="Building", column="kwh")
     weekly = weekly.reset_index().rename(columns={"kwh": "Weekly_kwh_Total"})
     return weekly
 
@@ -133,7 +122,7 @@ def generate_dashboard_plots(df_daily: pd.DataFrame, df_weekly: pd.DataFrame, df
     logging.info("Generating dashboard plot.")
     sns.set_style("whitegrid")
     if not df_combined.empty:
-        hourly = df_combined["kwh"].resample("H").mean().reset_index(name="kwh_hourly")
+        hourly = aggregate(df_combined, "H", "mean", column="kwh").reset_index(name="kwh_hourly")
         hourly["Hour"] = hourly["Timestamp"].dt.hour
         hourly_peak = hourly.groupby(["Hour"])["kwh_hourly"].mean().reset_index()
     else:
@@ -169,9 +158,7 @@ def generate_dashboard_plots(df_daily: pd.DataFrame, df_weekly: pd.DataFrame, df
     else:
         axes[2].text(0.5, 0.5, "No hourly data available", ha="center", va="center")
     plt.tight_layout()
-    out_file = OUTPUT_DIR / "dashboard.png"
-    fig.savefig(out_file, dpi=150)
-    plt.close(fig)
+    out_file = save_figure(fig, OUTPUT_DIR / "dashboard.png")
     logging.info("Dashboard saved to %s", out_file)
     return out_file
 
@@ -194,7 +181,7 @@ def generate_executive_summary(manager: BuildingManager, df_daily: pd.DataFrame,
         try:
             cleaned = pd.read_csv(OUTPUT_DIR / "cleaned_energy_data.csv", parse_dates=["Timestamp"])
             cleaned = cleaned.set_index("Timestamp")
-            hourly = cleaned["kwh"].resample("H").mean()
+            hourly = aggregate(cleaned, "H", "mean", column="kwh")
             peak_hour_overall = int(hourly.groupby(hourly.index.hour).mean().idxmax())
         except Exception:
             peak_hour_overall = None
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Throughput and memory benchmarks for the weather and energy pipelines.
+
+Generates synthetic CSV inputs of increasing size and runs each
+pipeline's load + aggregate stages on them twice: once parsing the CSV
+(cold start) and once from the memory-mapped snapshot (warm start).
+The time spent writing the snapshot during a cold start is reported
+separately from the cold time.
+
+Times are taken with no memory tracing active. Memory is measured in a
+separate run in a fresh process, as the growth of its peak resident set
+size (RSS), which includes pandas' C buffers and mapped snapshot pages.
+The shared packages must be installed (``pip install -e .``).
+
+Each result is appended as a JSON line to ``benchmarks/results.jsonl``,
+tagged with the current git commit, so runs can be compared across
+commits:
+
+    python benchmarks/bench_pipelines.py --sizes 1e4,1e5,1e6
+    python benchmarks/bench_pipelines.py --sizes 1e8 --pipelines weather
+    python benchmarks/bench_pipelines.py --compare
+"""
+
+import argparse
+import contextlib
+import datetime as dt
+import gc
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, memory is not measured
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+from timeseries_core import loader
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_FILE = Path(__file__).resolve().parent / "results.jsonl"
+DEFAULT_SIZES = "1e4,1e5,1e6"
+GEN_CHUNK = 1_000_000
+
+sys.path.insert(0, str(REPO_ROOT / "ASSIGNMENT-4"))
+sys.path.insert(0, str(REPO_ROOT / "ASSIGNMENT-5-CAPSTONE-PROJECT"))
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _write_chunks(path, header, n_rows, make_chunk):
+    """Write ``n_rows`` generated rows in fixed-size chunks to bound memory."""
+    rng = np.random.default_rng(42)
+    with open(path, "w") as fh:
+        fh.write(header + "\n")
+        for start in range(0, n_rows, GEN_CHUNK):
+            make_chunk(rng, start, min(GEN_CHUNK, n_rows - start)).to_csv(fh, header=False, index=False)
+
+
+def generate_weather(path, n_rows):
+    # Minute resolution keeps 10^8 rows inside pandas' timestamp range.
+    base = pd.Timestamp("1900-01-01")
+
+    def chunk(rng, start, n):
+        stamps = base + pd.to_timedelta(np.arange(start, start + n), unit="min")
+        temp = 20 + 10 * np.sin(np.arange(start, start + n) / 262_800) + rng.normal(0, 2, n)
+        temp[rng.random(n) < 0.01] = np.nan
+        return pd.DataFrame({
+            "Date": stamps.strftime("%Y-%m-%d %H:%M"),
+            "Temperature_C": temp.round(1),
+            "Rainfall_mm": rng.exponential(0.1, n).round(2),
+        })
+
+    _write_chunks(path, "Date,Temperature_C,Rainfall_mm", n_rows, chunk)
+
+
+def generate_energy(data_dir, n_rows, buildings=3):
+    base = pd.Timestamp("2000-01-01")
+    per_building = max(1, n_rows // buildings)
+
+    def chunk(rng, start, n):
+        stamps = base + pd.to_timedelta(np.arange(start, start + n), unit="s")
+        return pd.DataFrame({
+            "Timestamp": stamps.strftime("%Y-%m-%d %H:%M:%S"),
+            "kwh": rng.gamma(4.0, 4.0, n).round(2),
+        })
+
+    for b in range(buildings):
+        _write_chunks(Path(data_dir) / f"block_b{b}_energy.csv", "Timestamp,kwh", per_building, chunk)
+
+
+def run_weather(workdir):
+    import weather_analysis
+
+    df = weather_analysis.load_and_clean_data(str(Path(workdir) / "weather.csv"))
+    weather_analysis.analyze_data(df)
+    return len(df)
+
+
+def run_energy(workdir):
+    import energy_dashboard
+
+    energy_dashboard.DATA_DIR = Path(workdir) / "data"
+    df = energy_dashboard.ingest_and_validate_data()
+    energy_dashboard.calculate_daily_totals(df)
+    energy_dashboard.calculate_weekly_aggregates(df)
+    energy_dashboard.building_wise_summary(df)
+    return len(df)
+
+
+PIPELINES = {
+    "weather": ("weather_analysis", lambda d, n: generate_weather(Path(d) / "weather.csv", n), run_weather),
+    "energy": ("energy_dashboard", lambda d, n: (Path(d, "data").mkdir(), generate_energy(Path(d) / "data", n)),
+               run_energy),
+}
+
+
+def measure(run, workdir):
+    """Return ``(rows, seconds)`` of one run."""
+    gc.collect()
+    start = time.perf_counter()
+    rows = run(workdir)
+    return rows, time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def timed_snapshot_writes():
+    """Add up the time the loader spends in ``write_snapshot``."""
+    spent = [0.0]
+    write_snapshot = loader.write_snapshot
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return write_snapshot(*args, **kwargs)
+        finally:
+            spent[0] += time.perf_counter() - start
+
+    loader.write_snapshot = timed
+    try:
+        yield spent
+    finally:
+        loader.write_snapshot = write_snapshot
+
+
+def clear_snapshots(workdir):
+    for snap in Path(workdir).rglob("*.snapshot"):
+        shutil.rmtree(snap, ignore_errors=True)
+
+
+def measure_cold(run, workdir):
+    """Return ``(rows, seconds, write_seconds)``; ``seconds`` excludes the snapshot write."""
+    clear_snapshots(workdir)
+    with timed_snapshot_writes() as spent:
+        rows, seconds = measure(run, workdir)
+    return rows, seconds - spent[0], spent[0]
+
+
+def measure_warm(run, workdir):
+    rows, seconds = measure(run, workdir)
+    return rows, seconds, 0.0
+
+
+def _peak_rss():
+    # Linux keeps ru_maxrss across exec, so a spawned child would start at
+    # its parent's peak; VmHWM belongs to this process alone.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _peak_rss_growth(name, workdir, cold):
+    # Runs in a fresh process, so no earlier run has raised the high-water mark.
+    module, _, run = PIPELINES[name]
+    os.chdir(workdir)
+    importlib.import_module(module)
+    if cold:
+        clear_snapshots(workdir)
+    gc.collect()
+    before = _peak_rss()
+    run(workdir)
+    return _peak_rss() - before
+
+
+def measure_memory(name, workdir, cold):
+    """Peak RSS growth in bytes of one run in a new process, or ``None`` without ``resource``."""
+    if resource is None:
+        return None
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_peak_rss_growth, (name, workdir, cold))
+
+
+def run_benchmarks(sizes, pipelines, repeat):
+    """Time each pipeline on a cold start (CSV parse) and a warm start (snapshot).
+
+    The timed runs come first; each start is then run once more in a new
+    process to measure its memory.
+    """
+    commit = git_commit()
+    results = []
+    for name in pipelines:
+        module, generate, run = PIPELINES[name]
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                generate(workdir, size)
+                cwd = os.getcwd()
+                os.chdir(workdir)  # energy_dashboard writes into ./output on import
+                try:
+                    importlib.import_module(module)  # keep import time out of the measurement
+                    cold = min((measure_cold(run, workdir) for _ in range(repeat)), key=lambda r: r[1])
+                    warm = min((measure_warm(run, workdir) for _ in range(repeat)), key=lambda r: r[1])
+                    cold += (measure_memory(name, workdir, cold=True),)
+                    warm += (measure_memory(name, workdir, cold=False),)
+                finally:
+                    os.chdir(cwd)
+            for start, (rows, seconds, write_seconds, peak) in (("cold", cold), ("warm", warm)):
+                record = {
+                    "commit": commit,
+                    "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+                    "pipeline": name,
+                    "start": start,
+                    "rows": rows,
+                    "seconds": round(seconds, 4),
+                    "rows_per_s": round(rows / seconds) if seconds else None,
+                    "snapshot_write_s": round(write_seconds, 4),
+                    "peak_rss_mb": round(peak / 2**20, 1) if peak is not None else None,
+                }
+                memory = f"{record['peak_rss_mb']:>9.1f} MB peak RSS" if peak is not None else "memory n/a"
+                print(f"{name:<8} {start:<5} {rows:>12,} rows  {seconds:>9.3f}s  "
+                      f"{record['rows_per_s'] or 0:>12,} rows/s  {write_seconds:>7.3f}s snapshot write  {memory}")
+                results.append(record)
+    return results
+
+
+def compare(path=RESULTS_FILE):
+    """Print each (pipeline, rows) result of the latest commit against the previous commit."""
+    if not path.exists():
+        print("No results recorded yet.")
+        return
+    records = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    commits = list(dict.fromkeys(r["commit"] for r in records))
+    if len(commits) < 2:
+        print("Need results from at least two commits to compare.")
+        return
+    prev, last = commits[-2], commits[-1]
+    key = lambda r: (r["pipeline"], r.get("start", "cold"), r["rows"])
+    latest = {key(r): r for r in records if r["commit"] == last}
+    before = {key(r): r for r in records if r["commit"] == prev}
+    print(f"Comparing {last} against {prev}")
+    print(f"{'pipeline':<8} {'start':<5} {'rows':>12}  {'throughput':>10}  {'peak RSS':>11}")
+    for pipeline, start, rows in sorted(latest.keys() & before.keys()):
+        old, new = before[(pipeline, start, rows)], latest[(pipeline, start, rows)]
+        speed = new["rows_per_s"] / old["rows_per_s"] if old["rows_per_s"] else float("nan")
+        # Results from before the RSS pass only have the tracemalloc peak_mb.
+        if new.get("peak_rss_mb") is not None and old.get("peak_rss_mb") is not None:
+            memory = f"{new['peak_rss_mb'] - old['peak_rss_mb']:>+8.1f} MB"
+        else:
+            memory = f"{'n/a':>11}"
+        print(f"{pipeline:<8} {start:<5} {rows:>12,}  {speed:>9.2f}x  {memory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated row counts, e.g. 1e4,1e6,1e8")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help="weather,energy")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the fastest is kept")
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE, help="JSON-lines history file")
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history file")
+    parser.add_argument("--compare", action="store_true", help="compare the last two commits and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(args.results)
+        return 0
+
+    sizes = [int(float(s)) for s in args.sizes.split(",") if s.strip()]
+    pipelines = [p.strip() for p in args.pipelines.split(",") if p.strip()]
+    unknown = [p for p in pipelines if p not in PIPELINES]
+    if unknown:
+        parser.error(f"unknown pipeline: {unknown[0]}")
+
+    results = run_benchmarks(sizes, pipelines, args.repeat)
+    if not args.no_save:
+        with open(args.results, "a") as fh:
+            fh.writelines(json.dumps(r) + "\n" for r in results)
+        print(f"Appended {len(results)} results to {args.results}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
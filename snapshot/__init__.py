@@ -0,0 +1,26 @@
+"""Versioned, memory-mappable snapshots of parsed data files.
+
+After a tool has parsed a text source (CSV/JSON) it can store the result
+as one ``.npy`` file per column plus a small JSON header next to the
+source. On the next start ``load_snapshot`` memory-maps those columns
+instead of re-parsing, as long as the source file's size and mtime (and
+optionally its SHA-256) still match the header.
+"""
+
+from .store import (
+    SNAPSHOT_VERSION,
+    fingerprint,
+    load_snapshot,
+    remove_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "fingerprint",
+    "load_snapshot",
+    "remove_snapshot",
+    "snapshot_path",
+    "write_snapshot",
+]
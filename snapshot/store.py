@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+FORMAT_NAME = "krmu-snapshot"
+HEADER_FILE = "header.json"
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+def snapshot_path(source: PathLike) -> Path:
+    """Directory holding the snapshot of ``source`` (``<source>.snapshot``)."""
+    source = Path(source)
+    return source.with_name(source.name + ".snapshot")
+
+
+def _sha256(path: Path, block: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(block), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(source: PathLike, with_hash: bool = False) -> Dict[str, Any]:
+    """Size, mtime and (optionally) SHA-256 identifying a source file's contents."""
+    source = Path(source)
+    st = source.stat()
+    info = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        info["sha256"] = _sha256(source)
+    return info
+
+
+def _storable(name: str, values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind == "O":
+        # Object arrays cannot be memory-mapped; store text as fixed width.
+        if not all(isinstance(v, str) for v in values):
+            raise TypeError(f"Column '{name}' mixes text with other values")
+        values = values.astype(str)
+    if values.dtype.kind not in "biufcmMUS":
+        raise TypeError(f"Column '{name}' has unsupported dtype {values.dtype}")
+    return np.ascontiguousarray(values)
+
+
+def write_snapshot(
+    source: PathLike,
+    columns: Mapping[str, np.ndarray],
+    meta: Optional[Dict[str, Any]] = None,
+    with_hash: bool = False,
+    source_fingerprint: Optional[Dict[str, Any]] = None,
+) -> Optional[Path]:
+    """
+    Stores ``columns`` as a snapshot of ``source``.
+
+    ``source_fingerprint`` should be taken with ``fingerprint`` before
+    ``source`` was parsed. If the file no longer matches it when the
+    snapshot is ready (it was appended to or replaced during the parse),
+    nothing is written and ``None`` is returned, so a snapshot is never
+    labelled with a newer fingerprint than the data it holds.
+
+    The snapshot is built in a temporary directory and renamed into
+    place, so a reader never sees a half-written snapshot. Column names
+    are kept in the header; the ``.npy`` files are numbered.
+    """
+    source = Path(source)
+    target = snapshot_path(source)
+    stamp = dict(source_fingerprint or fingerprint(source))
+    if with_hash and "sha256" not in stamp:
+        stamp["sha256"] = _sha256(source)
+    header = {
+        "format": FORMAT_NAME,
+        "version": SNAPSHOT_VERSION,
+        "source": stamp,
+        "meta": meta or {},
+        "columns": [],
+    }
+
+    tmp = Path(tempfile.mkdtemp(prefix=target.name + ".", dir=target.parent))
+    try:
+        for i, (name, values) in enumerate(columns.items()):
+            values = _storable(name, values)
+            filename = f"col{i}.npy"
+            np.save(tmp / filename, values, allow_pickle=False)
+            header["columns"].append({"name": name, "file": filename,
+                                      "dtype": values.dtype.str, "length": len(values)})
+        (tmp / HEADER_FILE).write_text(json.dumps(header, indent=2))
+
+        current = fingerprint(source)
+        if (current["size"], current["mtime_ns"]) != (stamp["size"], stamp["mtime_ns"]):
+            log.info("%s changed while it was parsed; not writing a snapshot", source)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+
+        remove_snapshot(source)
+        os.replace(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return target
+
+
+def remove_snapshot(source: PathLike) -> None:
+    shutil.rmtree(snapshot_path(source), ignore_errors=True)
+
+
+def load_snapshot(
+    source: PathLike,
+    verify_hash: bool = False,
+) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+    """
+    Memory-maps the snapshot of ``source`` if it is still valid.
+
+    Returns ``(columns, meta)`` or ``None`` when there is no snapshot,
+    it was written by another format version, the source's size/mtime
+    (or SHA-256 with ``verify_hash``) changed, or a file is unreadable.
+    Callers compare the returned ``meta`` with their own load options.
+
+    The columns are copy-on-write maps: callers may modify them like any
+    parsed array, and the changes stay in memory instead of reaching the
+    snapshot files.
+    """
+    source = Path(source)
+    target = snapshot_path(source)
+    try:
+        header = json.loads((target / HEADER_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+    if header.get("format") != FORMAT_NAME or header.get("version") != SNAPSHOT_VERSION:
+        log.info("Snapshot of %s has an old format; ignoring", source)
+        return None
+
+    try:
+        current = fingerprint(source)
+    except OSError:
+        return None
+    stored = header.get("source", {})
+    if (stored.get("size"), stored.get("mtime_ns")) != (current["size"], current["mtime_ns"]):
+        log.info("Snapshot of %s is stale; ignoring", source)
+        return None
+    if verify_hash and stored.get("sha256") != _sha256(source):
+        log.info("Snapshot of %s does not match the source hash; ignoring", source)
+        return None
+
+    columns = {}
+    try:
+        for col in header["columns"]:
+            values = np.load(target / col["file"], mmap_mode="c", allow_pickle=False)
+            if values.dtype.str != col["dtype"] or len(values) != col["length"]:
+                return None
+            columns[col["name"]] = values
+    except (OSError, ValueError, KeyError):
+        return None
+    return columns, header.get("meta", {})
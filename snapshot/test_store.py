@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from snapshot import fingerprint, load_snapshot, snapshot_path, write_snapshot
+from snapshot.store import HEADER_FILE
+
+
+class SnapshotInvalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = Path(self.tmp.name) / "marks.csv"
+        self.source.write_text("Name,Marks\nann,50\nbob,60\n")
+        self.columns = {"name": np.array(["ann", "bob"]), "marks": np.array([50.0, 60.0])}
+        self.meta = {"loader": "test", "columns": ["name", "marks"]}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, **kwargs):
+        return write_snapshot(self.source, self.columns, self.meta, **kwargs)
+
+    def test_round_trip(self):
+        self.write()
+        columns, meta = load_snapshot(self.source)
+        self.assertEqual(meta, self.meta)
+        self.assertEqual(columns["name"].tolist(), ["ann", "bob"])
+        self.assertEqual(columns["marks"].tolist(), [50.0, 60.0])
+
+    def test_columns_are_copy_on_write(self):
+        self.write()
+        columns, _ = load_snapshot(self.source)
+        self.assertIsInstance(columns["marks"], np.memmap)
+        columns["marks"][0] = 99.0
+        self.assertEqual(load_snapshot(self.source)[0]["marks"].tolist(), [50.0, 60.0])
+
+    def test_missing_or_corrupt_header(self):
+        self.assertIsNone(load_snapshot(self.source))
+        self.write()
+        (snapshot_path(self.source) / HEADER_FILE).write_text("{not json")
+        self.assertIsNone(load_snapshot(self.source))
+
+    def test_size_change_invalidates(self):
+        self.write()
+        with self.source.open("a") as fh:
+            fh.write("cat,70\n")
+        self.assertIsNone(load_snapshot(self.source))
+
+    def test_mtime_change_invalidates(self):
+        self.write()
+        st = self.source.stat()
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(load_snapshot(self.source))
+
+    def test_hash_catches_same_size_and_mtime(self):
+        self.write(with_hash=True)
+        st = self.source.stat()
+        self.source.write_text("Name,Marks\nann,90\nbob,60\n")
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIsNotNone(load_snapshot(self.source))
+        self.assertIsNone(load_snapshot(self.source, verify_hash=True))
+
+    def test_version_or_format_mismatch_invalidates(self):
+        for key, value in (("version", 0), ("format", "other")):
+            self.write()
+            header_file = snapshot_path(self.source) / HEADER_FILE
+            header = json.loads(header_file.read_text())
+            header[key] = value
+            header_file.write_text(json.dumps(header))
+            self.assertIsNone(load_snapshot(self.source), key)
+
+    def test_column_mismatch_invalidates(self):
+        self.write()
+        np.save(snapshot_path(self.source) / "col1.npy", np.array([1.0, 2.0, 3.0]))
+        self.assertIsNone(load_snapshot(self.source))
+
+    def test_source_changed_during_parse(self):
+        before = fingerprint(self.source)
+        with self.source.open("a") as fh:
+            fh.write("cat,70\n")
+        self.assertIsNone(self.write(source_fingerprint=before))
+        self.assertFalse(snapshot_path(self.source).exists())
+
+    def test_rewrite_replaces_snapshot(self):
+        self.write()
+        with self.source.open("a") as fh:
+            fh.write("cat,70\n")
+        self.columns = {"name": np.array(["ann", "bob", "cat"]), "marks": np.array([50.0, 60.0, 70.0])}
+        self.write()
+        self.assertEqual(load_snapshot(self.source)[0]["name"].tolist(), ["ann", "bob", "cat"])
+
+
+class LoaderMetaTest(unittest.TestCase):
+    """``load_timeseries`` only reuses a snapshot written with the same options."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = Path(self.tmp.name) / "weather.csv"
+        self.source.write_text("Date,Temp\n2024-01-01,10\n2024-01-02,\n2024-01-03,14\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_options_mismatch_reparses(self):
+        from timeseries_core import load_timeseries
+
+        raw = load_timeseries(self.source, time_col="Date", snapshot=True)
+        self.assertTrue(np.isnan(raw["Temp"].iloc[1]))
+        filled = load_timeseries(self.source, time_col="Date", interpolate=True, snapshot=True)
+        self.assertEqual(filled["Temp"].iloc[1], 12.0)
+
+        _, meta = load_snapshot(self.source)
+        self.assertTrue(meta["options"]["interpolate"])
+        warm = load_timeseries(self.source, time_col="Date", interpolate=True, snapshot=True)
+        self.assertEqual(warm["Temp"].tolist(), [10.0, 12.0, 14.0])
+
+    def test_verify_hash(self):
+        from timeseries_core import load_timeseries
+
+        load_timeseries(self.source, time_col="Date", snapshot=True, verify_hash=True)
+        self.assertIn("sha256", json.loads((snapshot_path(self.source) / HEADER_FILE).read_text())["source"])
+        st = self.source.stat()
+        self.source.write_text("Date,Temp\n2024-01-01,90\n2024-01-02,\n2024-01-03,14\n")
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        stale = load_timeseries(self.source, time_col="Date", snapshot=True)
+        self.assertEqual(stale["Temp"].iloc[0], 10.0)
+        fresh = load_timeseries(self.source, time_col="Date", snapshot=True, verify_hash=True)
+        self.assertEqual(fresh["Temp"].iloc[0], 90.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
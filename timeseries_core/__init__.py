@@ -0,0 +1,20 @@
+"""Shared time-series helpers for the weather and energy assignments.
+
+``load_timeseries`` reads a CSV into a datetime-indexed DataFrame,
+``aggregate`` bins it by calendar frequency in a single resample pass and
+``plotting`` holds the chart/saving helpers both tools use.
+"""
+
+from .loader import detect_time_column, load_timeseries
+from .resample import aggregate, normalize_freq
+from .plotting import bar_chart, line_chart, save_figure
+
+__all__ = [
+    "aggregate",
+    "bar_chart",
+    "detect_time_column",
+    "line_chart",
+    "load_timeseries",
+    "normalize_freq",
+    "save_figure",
+]
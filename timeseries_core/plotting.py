@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import Union
+
+import matplotlib.pyplot as plt
+
+
+def line_chart(ax: plt.Axes, x, y, title: str = "", xlabel: str = "", ylabel: str = "", **kwargs) -> plt.Axes:
+    """Draws a labelled line series on ``ax``."""
+    kwargs.setdefault("linewidth", 2)
+    ax.plot(x, y, **kwargs)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    return ax
+
+
+def bar_chart(ax: plt.Axes, x, y, title: str = "", xlabel: str = "", ylabel: str = "", **kwargs) -> plt.Axes:
+    """Draws a labelled bar series on ``ax``."""
+    ax.bar(x, y, **kwargs)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    return ax
+
+
+def save_figure(fig: plt.Figure, path: Union[str, Path], dpi: int = 150, close: bool = True) -> Path:
+    """Saves ``fig`` (creating the parent directory) and closes it by default."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, dpi=dpi)
+    if close:
+        plt.close(fig)
+    return path
@@ -0,0 +1,61 @@
+import re
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+# Aliases removed in pandas 3 (``"H"`` raises there) mapped to their
+# current spelling, so callers can keep using the short forms.
+_LEGACY_FREQS = {
+    "H": "h",
+    "T": "min",
+    "S": "s",
+    "L": "ms",
+    "U": "us",
+    "N": "ns",
+    "M": "ME",
+    "BM": "BME",
+    "Q": "QE",
+    "BQ": "BQE",
+    "A": "YE",
+    "Y": "YE",
+}
+_FREQ_RE = re.compile(r"^(\d*)([A-Za-z]+)(-.+)?$")
+
+How = Union[str, List[str], Dict[str, Union[str, List[str]]]]
+
+
+def normalize_freq(freq: str) -> str:
+    """Translate legacy offset aliases (``"H"``, ``"M"``, ``"2T"``...) to current ones."""
+    match = _FREQ_RE.match(freq)
+    if not match:
+        return freq
+    mult, base, suffix = match.groups()
+    return f"{mult}{_LEGACY_FREQS.get(base, base)}{suffix or ''}"
+
+
+def aggregate(
+    data: Union[pd.Series, pd.DataFrame],
+    freq: str,
+    how: How = "mean",
+    by: Optional[str] = None,
+    column: Optional[str] = None,
+) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Bins datetime-indexed data by ``freq`` and applies ``how``.
+
+    All statistics are computed from one resample, so asking for
+    ``["mean", "min", "max"]`` bins the index once rather than three
+    times. With ``by``, each group is resampled separately (empty bins
+    between a group's first and last reading are kept, e.g. as 0 for
+    ``sum``).
+    """
+    freq = normalize_freq(freq)
+    if by is not None:
+        grouped = data.groupby(by)
+        if column is not None:
+            grouped = grouped[column]
+        return grouped.resample(freq).agg(how)
+
+    if column is not None:
+        data = data[column]
+    return data.resample(freq).agg(how)